@@ -1,11 +1,12 @@
 # app_functionality.py
 from base_construction import BaseConstructionApp
+from report_variants import CaseReport
 
-class ConstructionApp(BaseConstructionApp):
+class ConstructionApp(CaseReport, BaseConstructionApp):
     def __init__(self):
         super().__init__(
-            template_path="施工照片.docx",
-            saved_data_file="saved_data.json",
-            info_fields={"id": "案件編號", "address": "案件地址"}
+            template_path=self.template_path,
+            saved_data_file=self.saved_data_file,
+            info_fields=self.info_fields
         )
-    # 使用基底類別預設：輸出檔名為 "{id_value}.docx"，尺寸為 (6.5,10) cm
\ No newline at end of file
+    # 輸出檔名 "{id_value}.docx" 與尺寸 (10, 6.5) cm 由 CaseReport 提供
\ No newline at end of file
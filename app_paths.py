@@ -0,0 +1,19 @@
+# app_paths.py
+# 應用程式自己的檔案位置（快取、專案資料庫等），不依賴 Qt，GUI 與命令列共用
+import os
+
+APP_NAME = "ConstructionPhotoEditor"
+
+
+def user_cache_dir(*parts):
+    # Windows 使用 %LOCALAPPDATA%，其他系統使用 $XDG_CACHE_HOME 或 ~/.cache
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") \
+        or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, APP_NAME, *parts)
+
+
+def user_data_dir(*parts):
+    # Windows 使用 %APPDATA%，其他系統使用 $XDG_DATA_HOME 或 ~/.local/share
+    base = os.environ.get("APPDATA") or os.environ.get("XDG_DATA_HOME") \
+        or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(base, APP_NAME, *parts)
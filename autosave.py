@@ -0,0 +1,77 @@
+# autosave.py
+# 自動儲存：編輯後停頓 AUTOSAVE_DELAY_MS 才儲存，連續輸入只會觸發一次；
+# 要寫入的內容在主執行緒取得快照，實際的資料庫寫入在背景執行緒依序執行，不會卡住畫面
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+AUTOSAVE_DELAY_MS = 1500
+
+
+class AutoSaver(QObject):
+    # 寫入序號, 專案名稱, 錯誤訊息（成功時為空字串）
+    # signal 在寫入完成後才排入主執行緒，收到時畫面可能已切換專案，需以 is_current(序號) 判斷是否仍有效
+    finished = pyqtSignal(int, str, str)
+
+    def __init__(self, take_snapshot, delay=AUTOSAVE_DELAY_MS, parent=None):
+        """
+        :param take_snapshot: 在主執行緒呼叫，回傳 (專案名稱, 寫入函式)；沒有需要儲存的內容時回傳 None
+                              寫入函式在背景執行緒執行，不可存取畫面元件
+        :param delay: 最後一次編輯後等待多久才儲存（毫秒）
+        """
+        super().__init__(parent)
+        self.take_snapshot = take_snapshot
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay)
+        self.timer.timeout.connect(self.save_now)
+        # 單一執行緒：寫入依編輯順序進行，後面的變更不會被較早的寫入覆蓋
+        self.pool = ThreadPoolExecutor(max_workers=1)
+        self.last_future = None
+        self.sequence = 0  # 最近一次寫入的序號；invalidate() 也會遞增，使進行中的寫入結果失效
+
+    def schedule(self):
+        self.timer.start()
+
+    def cancel_pending(self):
+        # 放棄尚未開始的自動儲存（例如即將載入另一個專案或移除目前專案）
+        self.timer.stop()
+
+    def invalidate(self):
+        # 畫面換成另一個專案（載入或移除）後呼叫：之前送出的寫入完成時不再視為目前專案的結果
+        self.sequence += 1
+
+    def is_current(self, sequence):
+        return sequence == self.sequence
+
+    def save_now(self):
+        self.timer.stop()
+        snapshot = self.take_snapshot()
+        if snapshot is None:
+            return
+        name, write = snapshot
+        self.sequence += 1
+        sequence = self.sequence
+        future = self.pool.submit(write)
+        future.add_done_callback(lambda future: self._on_done(sequence, name, future))
+        self.last_future = future
+
+    def _on_done(self, sequence, name, future):
+        # 在背景執行緒中呼叫；signal 會排入主執行緒處理
+        error = future.exception()
+        self.finished.emit(sequence, name, "" if error is None else str(error))
+
+    def flush(self):
+        """
+        立即儲存尚未儲存的變更並等待所有寫入完成（關閉視窗、切換專案前呼叫）
+        :raise: 最後一次寫入失敗時拋出該例外
+        """
+        if self.timer.isActive():
+            self.save_now()
+        future, self.last_future = self.last_future, None
+        if future is not None:
+            future.result()  # 失敗只回報一次；重試由 finished 的處理者重新排程
+
+    def shutdown(self):
+        # 關閉時在最後一次 flush 之後呼叫：停止計時並等待背景寫入執行緒結束
+        self.timer.stop()
+        self.pool.shutdown(wait=True)
@@ -1,16 +1,23 @@
 # base_construction.py
 import sys, os, json
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QLabel, QLineEdit,
-    QListWidget, QPushButton, QMessageBox, QAbstractItemView, QCheckBox
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
+    QPushButton, QMessageBox, QCheckBox,
+    QSpinBox, QProgressBar, QMenu, QFileDialog
 )
-from PyQt5.QtCore import QSettings
-from docxtpl import DocxTemplate, InlineImage
-from docx.shared import Cm
-from PIL import Image, ImageDraw, ImageFont
-from io import BytesIO
+from PyQt5.QtCore import QTimer
 
-from widgets import FormItemWidget
+import buffer_arena
+from generation_worker import GenerationWorker
+from import_worker import PhotoImportWorker
+from instrumentation import log_event
+from photo_cache import PhotoCache
+from project_store import default_store, project_name
+from autosave import AutoSaver
+from project_picker import ProjectPicker
+from item_list import ProjectItemModel, ItemListView
+
+IMPORT_BATCH_SIZE = 50  # 批次匯入時每次加入的項目數，分批加入讓畫面在匯入期間保持回應
 
 class BaseConstructionApp(QWidget):
     def __init__(self, template_path, saved_data_file, info_fields):
@@ -24,18 +31,20 @@ class BaseConstructionApp(QWidget):
         self.template_path = template_path
         self.saved_data_file = saved_data_file  # 此參數僅用於區分不同版本
         self.info_fields = info_fields
-        self.doc = DocxTemplate(self.template_path)
-        self.image_bytes_list = []  # 用來保存圖片 BytesIO 物件
+        self.generation_worker = None
+        self.import_worker = None
+        self.import_queue = []
+        self.photo_cache = PhotoCache()  # 已處理照片的磁碟快取，重複生成時只處理有變動的照片
+        self.store = default_store()
+        # 自動儲存：saved_name 為目前畫面內容在資料庫中對應的專案名稱，None 表示尚未儲存過
+        self.saved_name = None
+        self.autosaver = AutoSaver(self.take_autosave_snapshot, parent=self)
+        self.autosaver.finished.connect(self.on_autosave_finished)
         self.init_ui()
         self.load_saved_projects()
 
-    def get_output_filename(self, id_value, address_value):
-        # 預設邏輯（案件版）：輸出檔名為 "{id_value}.docx"
-        return f"{id_value}.docx"
-
-    def get_photo_dimensions(self):
-        # 預設尺寸 (案件版)：寬 6.5 cm, 高 10 cm
-        return (10, 6.5)
+    # 輸出檔名（get_output_filename）與照片尺寸（get_photo_dimensions）
+    # 由子類別混入的 report_variants 版本類別提供
 
     def init_ui(self):
         self.setGeometry(100, 100, 1200, 800)
@@ -44,10 +53,9 @@ class BaseConstructionApp(QWidget):
         
         # 基本資訊區：根據 info_fields 設定欄位標籤
         info_layout = QHBoxLayout()
-        self.project_selector = QComboBox()
         default_text = "選擇或創建新案子" if self.info_fields["id"] == "案件編號" else "選擇或創建新站"
-        self.project_selector.addItem(default_text)
-        self.project_selector.currentIndexChanged.connect(self.load_selected_project)
+        self.project_selector = ProjectPicker(self.store, self.info_fields["id"], default_text)
+        self.project_selector.project_chosen.connect(self.load_selected_project)
         info_layout.addWidget(self.project_selector)
         
         self.id_label = QLabel(f"{self.info_fields['id']}：")
@@ -63,17 +71,24 @@ class BaseConstructionApp(QWidget):
         info_layout.addWidget(self.address_input)
         
         layout.addLayout(info_layout)
+        # 編號、地址在輸入完成（離開欄位或按 Enter）後才自動儲存，避免輸入到一半就建立專案
+        self.id_input.editingFinished.connect(self.autosaver.schedule)
+        self.address_input.editingFinished.connect(self.autosaver.schedule)
         
-        # 列表顯示施工項目
-        self.item_list = QListWidget()
-        self.item_list.setDragDropMode(QAbstractItemView.InternalMove)
+        # 列表顯示施工項目（只為看得到的列建立編輯元件）
+        self.item_model = ProjectItemModel(self)
+        for signal in (self.item_model.dataChanged, self.item_model.rowsInserted,
+                       self.item_model.rowsRemoved, self.item_model.rowsMoved):
+            signal.connect(self.autosaver.schedule)
+        self.item_list = ItemListView()
+        self.item_list.setModel(self.item_model)
         self.item_list.setStyleSheet("""
-            QListWidget::item:hover {
+            QListView::item:hover {
                 background-color: #CCE5FF;
                 border-radius: 15px;
                 padding: 5px;
             }
-            QListWidget::item:selected {
+            QListView::item:selected {
                 background-color: #A8D4FF;
                 border-radius: 15px;
                 padding: 5px;
@@ -99,6 +114,30 @@ class BaseConstructionApp(QWidget):
         self.add_item_button.clicked.connect(self.add_form_item)
         btn_layout.addWidget(self.add_item_button)
         
+        # 批次匯入照片：多選或整個資料夾，依拍攝時間排序並填入時間
+        self.import_button = QPushButton("匯入照片")
+        self.import_button.setStyleSheet("""
+            QPushButton {
+                background-color: #E5CCFF;
+                border: none;
+                border-radius: 10px;
+                padding: 10px;
+                font-size: 25px;
+                font-weight: bold;
+            }
+            QPushButton:hover { background-color: #D9B3FF; }
+            QPushButton:pressed { background-color: #CC99FF; }
+            QPushButton::menu-indicator { width: 0px; }
+        """)
+        import_menu = QMenu(self.import_button)
+        import_menu.addAction("選擇多張照片…", self.browse_import_files)
+        import_menu.addAction("選擇資料夾…", self.browse_import_folder)
+        self.import_button.setMenu(import_menu)
+        btn_layout.addWidget(self.import_button)
+        self.import_timer = QTimer(self)
+        self.import_timer.setInterval(0)
+        self.import_timer.timeout.connect(self.append_import_batch)
+        
         self.delete_selected_button = QPushButton("刪除選取項目")
         self.delete_selected_button.setStyleSheet("""
             QPushButton {
@@ -132,9 +171,24 @@ class BaseConstructionApp(QWidget):
         btn_layout.addWidget(self.remove_project_button)
         layout.addLayout(btn_layout)
         
-        # 燒光碟選項與生成文檔按鈕
+        # 燒光碟選項、同時處理照片數與生成文檔按鈕
+        options_layout = QHBoxLayout()
         self.burn_disc_checkbox = QCheckBox("是否燒光碟")
-        layout.addWidget(self.burn_disc_checkbox)
+        options_layout.addWidget(self.burn_disc_checkbox)
+        options_layout.addStretch()
+        # 項目很多時分成多份文檔，每份在存檔後釋放記憶體，Word 也較容易開啟
+        options_layout.addWidget(QLabel("每冊項目數："))
+        self.chunk_size_spinbox = QSpinBox()
+        self.chunk_size_spinbox.setRange(0, 10000)
+        self.chunk_size_spinbox.setSingleStep(50)
+        self.chunk_size_spinbox.setSpecialValueText("不分冊")
+        options_layout.addWidget(self.chunk_size_spinbox)
+        options_layout.addWidget(QLabel("同時處理照片數："))
+        self.workers_spinbox = QSpinBox()
+        self.workers_spinbox.setRange(1, 64)
+        self.workers_spinbox.setValue(os.cpu_count() or 1)
+        options_layout.addWidget(self.workers_spinbox)
+        layout.addLayout(options_layout)
         
         self.generate_button = QPushButton("生成文檔")
         self.generate_button.setStyleSheet("""
@@ -152,110 +206,207 @@ class BaseConstructionApp(QWidget):
         self.generate_button.clicked.connect(self.generate_document)
         layout.addWidget(self.generate_button)
         
+        # 生成進度（已處理照片數 / 總數）與取消按鈕，僅在生成期間顯示
+        progress_layout = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setFormat("%v / %m")
+        progress_layout.addWidget(self.progress_bar)
+        self.cancel_button = QPushButton("取消")
+        self.cancel_button.clicked.connect(self.cancel_generation)
+        progress_layout.addWidget(self.cancel_button)
+        layout.addLayout(progress_layout)
+        self.progress_bar.hide()
+        self.cancel_button.hide()
+        
         self.setLayout(layout)
 
     def add_form_item(self, item_data=None):
-        widget = FormItemWidget(item_data)
-        from PyQt5.QtWidgets import QListWidgetItem
-        list_item = QListWidgetItem()
-        list_item.setSizeHint(widget.sizeHint())
-        self.item_list.addItem(list_item)
-        self.item_list.setItemWidget(list_item, widget)
+        # 由按鈕觸發時 item_data 為 clicked 的 bool 參數
+        self.item_model.append_item(item_data or None)
+        self.item_list.scrollToBottom()
+
+    def browse_import_files(self):
+        file_paths, _ = QFileDialog.getOpenFileNames(
+            self, "選擇要匯入的圖片", "",
+            "Images (*.png *.jpg *.jpeg *.bmp);;All Files (*)"
+        )
+        if file_paths:
+            self.import_photos(paths=file_paths)
+
+    def browse_import_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "選擇要匯入的資料夾")
+        if folder:
+            self.import_photos(folder=folder)
+
+    def import_photos(self, paths=None, folder=None):
+        # EXIF 在背景讀取，完成後再分批加入清單
+        if self.import_worker is not None or self.import_timer.isActive():
+            return
+        self.import_button.setEnabled(False)
+        self.import_button.setText("匯入中…")
+        self.import_worker = PhotoImportWorker(paths, folder, self)
+        self.import_worker.loaded.connect(self.on_import_loaded)
+        self.import_worker.failed.connect(self.on_import_failed)
+        self.import_worker.finished.connect(self.on_import_worker_finished)
+        self.import_worker.start()
+
+    def on_import_loaded(self, items):
+        self.import_queue = items
+        self.import_timer.start()
+
+    def on_import_failed(self, message):
+        QMessageBox.critical(self, "錯誤", message)
+
+    def on_import_worker_finished(self):
+        self.import_worker.deleteLater()
+        self.import_worker = None
+        if not self.import_timer.isActive():
+            self.finish_import()
+
+    def append_import_batch(self):
+        batch = self.import_queue[:IMPORT_BATCH_SIZE]
+        del self.import_queue[:IMPORT_BATCH_SIZE]
+        self.item_model.append_items(batch)
+        # 預先在背景執行緒池解碼縮圖，捲動到這些項目時可直接顯示
+        for item in batch:
+            self.item_model.thumbnail(item['圖片路徑'])
+        if not self.import_queue:
+            self.import_timer.stop()
+            self.item_list.scrollToBottom()
+            self.finish_import()
+
+    def finish_import(self):
+        self.import_button.setEnabled(True)
+        self.import_button.setText("匯入照片")
 
     def delete_selected_items(self):
-        for item in self.item_list.selectedItems():
-            row = self.item_list.row(item)
-            self.item_list.takeItem(row)
+        rows = sorted({index.row() for index in self.item_list.selectedIndexes()}, reverse=True)
+        for row in rows:
+            self.item_model.removeRow(row)
+
+    def collect_project_data(self):
+        # 將畫面上的輸入內容整理為專案資料字典（與 save_current_project 寫入的格式相同）
+        project_data = {
+            self.info_fields["id"]: self.id_input.text().strip(),
+            self.info_fields["address"]: self.address_input.text().strip(),
+            'items': self.item_model.items()
+        }
+        return project_data
 
     def generate_document(self):
-        from docxtpl import InlineImage
-        id_value = self.id_input.text()
-        address_value = self.address_input.text()
-        if not id_value or not address_value:
-            QMessageBox.warning(self, "警告", f"請輸入{self.info_fields['id']}和{self.info_fields['address']}")
-            return
-        if self.item_list.count() == 0:
-            QMessageBox.warning(self, "警告", "請至少添加一組內容")
+        if self.generation_worker is not None:
             return
-        try:
-            processed_items = []
-            folder_name = f"照片-{id_value}-{address_value}"
-            if self.burn_disc_checkbox.isChecked() and not os.path.exists(folder_name):
-                os.makedirs(folder_name)
-            width_val, height_val = self.get_photo_dimensions()
-            for i in range(self.item_list.count()):
-                item = self.item_list.item(i)
-                widget = self.item_list.itemWidget(item)
-                data = widget.get_data()
-                description = data['施工說明']
-                time_val = data['時間']
-                image_path = data['圖片路徑']
-                show_time = data['標註時間']
-                if not description or not time_val or not image_path:
-                    QMessageBox.warning(self, "警告", "請填寫所有欄位並選擇圖片")
-                    return
-                if self.burn_disc_checkbox.isChecked():
-                    save_path = os.path.join(folder_name, f"{i+1:02d}-{description}-{id_value}-{address_value}.jpg")
-                    original_image = Image.open(image_path)
-                    if original_image.mode == 'RGBA':
-                        original_image = original_image.convert('RGB')
-                    original_image.save(save_path)
-                if show_time:
-                    try:
-                        dpi = 1024
-                        width_px = int(width_val * dpi / 2.54)
-                        height_px = int(height_val * dpi / 2.54)
-                        image = Image.open(image_path)
-                        image = image.resize((width_px, height_px), Image.LANCZOS)
-                        if image.mode == 'RGBA':
-                            image = image.convert('RGB')
-                        draw = ImageDraw.Draw(image)
-                        font_size = dpi // 6
-                        try:
-                            font = ImageFont.truetype("arial.ttf", font_size)
-                        except Exception:
-                            font = ImageFont.load_default()
-                        bbox = draw.textbbox((0, 0), time_val, font=font)
-                        text_width = bbox[2] - bbox[0]
-                        text_height = bbox[3] - bbox[1]
-                        text_position = (image.width - text_width - 50, image.height - text_height - 120)
-                        draw.text(text_position, time_val, font=font, fill="red")
-                        image_bytes = BytesIO()
-                        image.save(image_bytes, format='JPEG')
-                        image_bytes.seek(0)
-                        self.image_bytes_list.append(image_bytes)
-                        inline_image = InlineImage(self.doc, image_bytes, width=Cm(width_val), height=Cm(height_val))
-                    except Exception as e:
-                        QMessageBox.critical(self, "錯誤", f"在圖片上標註時間時出錯：{e}")
-                        return
-                else:
-                    inline_image = InlineImage(self.doc, image_path, width=Cm(width_val), height=Cm(height_val))
-                item_context = {
-                    self.info_fields["id"]: id_value,
-                    '內容': description,
-                    '時間': time_val,
-                    '圖片': inline_image
-                }
-                processed_items.append(item_context)
-            context = {'items': processed_items}
-            output_path = self.get_output_filename(id_value, address_value)
-            self.doc.render(context)
-            self.doc.save(output_path)
-            QMessageBox.information(self, "成功", f"文檔已生成：{output_path}")
-        except Exception as e:
-            QMessageBox.critical(self, "錯誤", f"生成文檔時出錯：{e}")
+        # 先在主執行緒取得輸入內容的快照，生成期間使用者可以繼續編輯
+        project_data = self.collect_project_data()
+        self.generation_worker = GenerationWorker(
+            project_data, self, self,
+            burn_disc=self.burn_disc_checkbox.isChecked(),
+            chunk_size=self.chunk_size_spinbox.value() or None,
+            cache=self.photo_cache,
+            workers=self.workers_spinbox.value()
+        )
+        self.generation_worker.progress.connect(self.on_generation_progress)
+        self.generation_worker.succeeded.connect(self.on_generation_succeeded)
+        self.generation_worker.failed.connect(self.on_generation_failed)
+        self.generation_worker.cancelled.connect(self.on_generation_cancelled)
+        self.generation_worker.finished.connect(self.on_generation_finished)
+        self.progress_bar.setRange(0, len(project_data['items']))
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+        self.cancel_button.setEnabled(True)
+        self.cancel_button.show()
+        self.generate_button.setEnabled(False)
+        self.generation_worker.start()
+
+    def cancel_generation(self):
+        if self.generation_worker is not None:
+            self.cancel_button.setEnabled(False)
+            self.generation_worker.cancel()
+
+    def wait_for_generation(self):
+        # 關閉視窗前呼叫：取消進行中的生成並等待背景執行緒（含照片匯入）結束
+        if self.generation_worker is not None:
+            self.generation_worker.cancel()
+            self.generation_worker.wait()
+        if self.import_worker is not None:
+            self.import_worker.wait()
+
+    def on_generation_progress(self, done, total):
+        self.progress_bar.setValue(done)
+
+    def on_generation_succeeded(self, output_path):
+        log_event("memory", **buffer_arena.stats())
+        QMessageBox.information(self, "成功", f"文檔已生成：{output_path}")
+
+    def on_generation_failed(self, message, is_warning):
+        if is_warning:
+            QMessageBox.warning(self, "警告", message)
+        else:
+            QMessageBox.critical(self, "錯誤", message)
+
+    def on_generation_cancelled(self):
+        QMessageBox.information(self, "取消", "已取消生成文檔")
+
+    def on_generation_finished(self):
+        self.progress_bar.hide()
+        self.cancel_button.hide()
+        self.generate_button.setEnabled(True)
+        self.generation_worker.deleteLater()
+        self.generation_worker = None
     
     def clear_form_items(self):
-        self.item_list.clear()
+        self.item_model.set_items([])
 
     
-    # 以下使用 QSettings 存取專案資料
+    # 以下使用 project_store（SQLite）存取專案資料
+    def take_autosave_snapshot(self):
+        # 由 AutoSaver 在主執行緒呼叫：取得要寫入的內容，回傳 (專案名稱, 背景寫入函式)
+        id_value = self.id_input.text().strip()
+        address_value = self.address_input.text().strip()
+        if not id_value or not address_value:
+            return None
+        namespace = self.info_fields["id"]
+        name = project_name(id_value, address_value)
+        if name != self.saved_name:
+            # 新專案、編號或地址改變、或上次儲存失敗：寫入完整專案
+            project_data = self.collect_project_data()
+            self.item_model.take_changes()
+            write = lambda: self.store.save_project(namespace, project_data, self.info_fields)
+        elif self.item_model.has_changes():
+            # 只寫入有變動的項目
+            changed_items, item_count = self.item_model.take_changes()
+            write = lambda: self.store.save_items(namespace, id_value, address_value, changed_items, item_count)
+        else:
+            return None
+        self.saved_name = name
+        return name, write
+
+    def on_autosave_finished(self, sequence, name, error):
+        if error:
+            print(f"自動儲存失敗：{name}：{error}")
+            log_event("autosave_failed", project=name, error=error)
+        # 之後又送出了新的寫入，或畫面已換成其他專案：結果已過時，不更新畫面
+        if not self.autosaver.is_current(sequence) or name != self.saved_name:
+            return
+        if error:
+            # 下次改為寫入完整專案，並重新排程自動儲存以重試
+            self.saved_name = None
+            self.item_model.mark_all_dirty()
+            self.autosaver.schedule()
+            return
+        id_value = self.id_input.text().strip()
+        address_value = self.address_input.text().strip()
+        if name != project_name(id_value, address_value):
+            return  # 編號或地址已修改，等下一次自動儲存
+        if self.project_selector.current_project() != name:
+            self.project_selector.set_current(name)
+            self.project_selector.refresh()
+
+    def flush_autosave(self):
+        # 立即寫入尚未儲存的變更並等待完成；寫入失敗時拋出例外
+        self.autosaver.flush()
+
     def save_current_project(self):
-        from PyQt5.QtCore import QSettings
-        import json
-        
-        settings = QSettings("MyCompany", f"ConstructionPhotoEditor_{self.info_fields['id']}")
-        
         id_value = self.id_input.text().strip()
         address_value = self.address_input.text().strip()
         
@@ -264,64 +415,60 @@ class BaseConstructionApp(QWidget):
             print("未輸入任何文字，不儲存")
             return
         
-        project_name = f"{id_value}-{address_value}"
-        project_data = {
-            self.info_fields["id"]: id_value,
-            self.info_fields["address"]: address_value,
-            'items': []
-        }
-        
-        # 收集 item_list 中每個項目的資料
-        for i in range(self.item_list.count()):
-            item = self.item_list.item(i)
-            widget = self.item_list.itemWidget(item)
-            project_data['items'].append(widget.get_data())
-        
-        # 寫入 QSettings
-        settings.setValue(project_name, json.dumps(project_data, ensure_ascii=False, indent=4))
+        try:
+            self.autosaver.save_now()
+            self.flush_autosave()
+        except Exception as e:
+            QMessageBox.critical(self, "錯誤", f"儲存項目時出錯：{e}")
+            return
+        project_name = self.saved_name
+        self.project_selector.set_current(project_name)
+        self.project_selector.refresh()
         print(f"Project saved: {project_name}")
     
     def load_saved_projects(self):
-        from PyQt5.QtCore import QSettings
-        settings = QSettings("MyCompany", f"ConstructionPhotoEditor_{self.info_fields['id']}")
-        keys = settings.allKeys()
-        for key in keys:
-            self.project_selector.addItem(key)
+        # 第一次啟動時把舊版 QSettings 中的專案移轉到資料庫；
+        # 專案清單由選擇器在需要時從資料庫分頁查詢，不在啟動時全部載入
+        self.store.migrate_from_qsettings(self.info_fields["id"], self.info_fields)
     
-    def load_selected_project(self):
-        from PyQt5.QtCore import QSettings
-        import json
-        settings = QSettings("MyCompany", f"ConstructionPhotoEditor_{self.info_fields['id']}")
-        selected_index = self.project_selector.currentIndex()
-        if selected_index == 0:
-            return
-        project_name = self.project_selector.currentText()
-        project_json = settings.value(project_name)
-        if project_json:
-            try:
-                project_data = json.loads(project_json)
+    def load_selected_project(self, project_name):
+        try:
+            # 先寫入目前專案尚未儲存的變更
+            self.flush_autosave()
+            project_data = self.store.load_project(self.info_fields["id"], project_name, self.info_fields)
+            if project_data:
+                self.autosaver.invalidate()
                 self.id_input.setText(project_data[self.info_fields["id"]])
                 self.address_input.setText(project_data[self.info_fields["address"]])
-                self.clear_form_items()
-                for item_data in project_data['items']:
-                    self.add_form_item(item_data)
-            except Exception as e:
-                QMessageBox.critical(self, "錯誤", f"加載項目時出錯：{e}")
+                self.item_model.set_items(project_data['items'])
+                self.saved_name = project_name
+        except Exception as e:
+            QMessageBox.critical(self, "錯誤", f"加載項目時出錯：{e}")
     
     def remove_project(self):
-        from PyQt5.QtCore import QSettings
-        settings = QSettings("MyCompany", f"ConstructionPhotoEditor_{self.info_fields['id']}")
-        selected_index = self.project_selector.currentIndex()
-        if selected_index == 0:
+        project_name = self.project_selector.current_project()
+        if not project_name:
             QMessageBox.warning(self, "警告", f"請選擇要移除的{self.info_fields['id']}")
             return
-        project_name = self.project_selector.currentText()
-        settings.remove(project_name)
-        self.project_selector.removeItem(selected_index)
+        # 放棄尚未寫入的自動儲存，避免移除後又被寫回
+        self.autosaver.cancel_pending()
+        try:
+            self.autosaver.flush()
+            self.store.remove_project(self.info_fields["id"], project_name)
+        except Exception as e:
+            QMessageBox.critical(self, "錯誤", f"移除項目時出錯：{e}")
+            return
+        self.autosaver.invalidate()
+        self.saved_name = None
+        self.project_selector.set_current(None)
+        self.project_selector.refresh()
         QMessageBox.information(self, "成功", f"{self.info_fields['id']} '{project_name}' 已被移除")
     
     def closeEvent(self, event):
-        # 不自動儲存
-        for image_bytes in self.image_bytes_list:
-            image_bytes.close()
+        self.wait_for_generation()
+        try:
+            self.flush_autosave()
+        except Exception as e:
+            print("存檔錯誤：", e)
+        self.autosaver.shutdown()
         event.accept()
\ No newline at end of file
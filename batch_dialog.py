@@ -0,0 +1,205 @@
+# batch_dialog.py
+# 批次生成視窗：從案件版與捷運版已儲存的專案中勾選多個，排入佇列一次生成，並顯示每個工作的狀態
+import os
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QListWidget,
+    QListWidgetItem, QTableWidget, QTableWidgetItem, QSpinBox, QCheckBox, QFileDialog,
+    QHeaderView, QMessageBox
+)
+from PyQt5.QtCore import Qt, QObject, QTimer, pyqtSignal
+
+from report_variants import VARIANTS
+from photo_cache import PhotoCache
+from batch_jobs import (
+    BatchJob, JobScheduler, generate_saved_project, default_photo_workers,
+    DONE, FAILED, CANCELLED
+)
+
+FINAL_STATUSES = (DONE, FAILED, CANCELLED)
+PROJECT_ROLE = Qt.UserRole
+
+
+class _JobSignals(QObject):
+    updated = pyqtSignal(object)  # BatchJob
+
+
+class BatchDialog(QDialog):
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.variants = [variant_class() for variant_class in VARIANTS.values()]
+        self.checked = set()   # 已勾選的 (版本名稱, 專案名稱)
+        self.scheduler = None
+        self.jobs = []
+        self.job_rows = {}
+        self.signals = _JobSignals()
+        self.signals.updated.connect(self.on_job_updated)
+        self.init_ui()
+        self.load_projects()
+
+    def init_ui(self):
+        self.setWindowTitle("批次生成")
+        self.resize(1000, 800)
+        layout = QVBoxLayout(self)
+
+        # 專案清單（可搜尋、勾選）
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("搜尋："))
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("輸入編號或地址的開頭")
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(150)
+        self._filter_timer.timeout.connect(self.load_projects)
+        self.filter_input.textEdited.connect(lambda text: self._filter_timer.start())
+        filter_layout.addWidget(self.filter_input)
+        select_all_button = QPushButton("全選")
+        select_all_button.clicked.connect(lambda: self.set_all_checked(True))
+        filter_layout.addWidget(select_all_button)
+        select_none_button = QPushButton("全不選")
+        select_none_button.clicked.connect(lambda: self.set_all_checked(False))
+        filter_layout.addWidget(select_none_button)
+        layout.addLayout(filter_layout)
+
+        self.project_list = QListWidget()
+        self.project_list.itemChanged.connect(self.on_project_checked)
+        layout.addWidget(self.project_list, stretch=1)
+
+        # 生成設定
+        options_layout = QHBoxLayout()
+        options_layout.addWidget(QLabel("輸出目錄："))
+        self.output_dir_input = QLineEdit(os.getcwd())
+        options_layout.addWidget(self.output_dir_input)
+        browse_button = QPushButton("瀏覽")
+        browse_button.clicked.connect(self.browse_output_dir)
+        options_layout.addWidget(browse_button)
+        options_layout.addWidget(QLabel("同時執行："))
+        self.concurrency_spinbox = QSpinBox()
+        self.concurrency_spinbox.setRange(1, 16)
+        self.concurrency_spinbox.setValue(2)
+        options_layout.addWidget(self.concurrency_spinbox)
+        options_layout.addWidget(QLabel("失敗重試次數："))
+        self.retries_spinbox = QSpinBox()
+        self.retries_spinbox.setRange(0, 10)
+        self.retries_spinbox.setValue(2)
+        options_layout.addWidget(self.retries_spinbox)
+        options_layout.addWidget(QLabel("每冊項目數："))
+        self.chunk_size_spinbox = QSpinBox()
+        self.chunk_size_spinbox.setRange(0, 10000)
+        self.chunk_size_spinbox.setSingleStep(50)
+        self.chunk_size_spinbox.setSpecialValueText("不分冊")
+        options_layout.addWidget(self.chunk_size_spinbox)
+        self.burn_disc_checkbox = QCheckBox("是否燒光碟")
+        options_layout.addWidget(self.burn_disc_checkbox)
+        layout.addLayout(options_layout)
+
+        # 工作狀態
+        self.status_table = QTableWidget(0, 5)
+        self.status_table.setHorizontalHeaderLabels(["版本", "專案", "狀態", "嘗試次數", "結果"])
+        self.status_table.horizontalHeader().setSectionResizeMode(4, QHeaderView.Stretch)
+        self.status_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.status_table, stretch=1)
+
+        button_layout = QHBoxLayout()
+        self.start_button = QPushButton("開始生成")
+        self.start_button.clicked.connect(self.start)
+        button_layout.addWidget(self.start_button)
+        self.cancel_button = QPushButton("取消")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel)
+        button_layout.addWidget(self.cancel_button)
+        layout.addLayout(button_layout)
+
+    # ---- 專案清單 ----
+    def load_projects(self):
+        self.project_list.blockSignals(True)
+        self.project_list.clear()
+        for variant in self.variants:
+            namespace = variant.info_fields["id"]
+            for name, *_ in self.store.search_projects(namespace, self.filter_input.text(), limit=-1):
+                item = QListWidgetItem(f"[{variant.label}] {name}")
+                item.setData(PROJECT_ROLE, (variant.name, name))
+                item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+                item.setCheckState(Qt.Checked if (variant.name, name) in self.checked else Qt.Unchecked)
+                self.project_list.addItem(item)
+        self.project_list.blockSignals(False)
+
+    def on_project_checked(self, item):
+        key = item.data(PROJECT_ROLE)
+        if item.checkState() == Qt.Checked:
+            self.checked.add(key)
+        else:
+            self.checked.discard(key)
+
+    def set_all_checked(self, checked):
+        # 只影響目前搜尋結果中顯示的專案
+        for i in range(self.project_list.count()):
+            self.project_list.item(i).setCheckState(Qt.Checked if checked else Qt.Unchecked)
+
+    def browse_output_dir(self):
+        directory = QFileDialog.getExistingDirectory(self, "選擇輸出目錄", self.output_dir_input.text())
+        if directory:
+            self.output_dir_input.setText(directory)
+
+    # ---- 佇列 ----
+    def start(self):
+        if not self.checked:
+            QMessageBox.warning(self, "警告", "請至少勾選一個專案")
+            return
+        output_dir = self.output_dir_input.text().strip()
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        variants = {variant.name: variant for variant in self.variants}
+        self.jobs = [BatchJob(variants[variant_name], name) for variant_name, name in sorted(self.checked)]
+        self.status_table.setRowCount(len(self.jobs))
+        self.job_rows = {}
+        for row, job in enumerate(self.jobs):
+            self.job_rows[id(job)] = row
+            self.update_job_row(job)
+
+        max_concurrent = self.concurrency_spinbox.value()
+        options = {
+            "output_dir": output_dir,
+            "burn_disc": self.burn_disc_checkbox.isChecked(),
+            "chunk_size": self.chunk_size_spinbox.value() or None,
+            "cache": PhotoCache(),
+            "workers": default_photo_workers(max_concurrent),
+        }
+        self.scheduler = JobScheduler(
+            lambda job, cancel_event: generate_saved_project(job, self.store, cancel_event, **options),
+            max_concurrent=max_concurrent,
+            max_retries=self.retries_spinbox.value(),
+            on_update=self.signals.updated.emit
+        )
+        self.start_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.scheduler.submit(self.jobs)
+
+    def cancel(self):
+        if self.scheduler is not None:
+            self.cancel_button.setEnabled(False)
+            self.scheduler.cancel()
+
+    def update_job_row(self, job):
+        row = self.job_rows[id(job)]
+        result = job.output_path if job.status == DONE else (job.error or "")
+        for column, text in enumerate([job.variant.label, job.project_name, job.status, str(job.attempts), result]):
+            self.status_table.setItem(row, column, QTableWidgetItem(text))
+
+    def on_job_updated(self, job):
+        self.update_job_row(job)
+        if self.scheduler is not None and all(job.status in FINAL_STATUSES for job in self.jobs):
+            self.scheduler.wait()
+            self.scheduler = None
+            self.start_button.setEnabled(True)
+            self.cancel_button.setEnabled(False)
+            done = sum(job.status == DONE for job in self.jobs)
+            QMessageBox.information(self, "完成", f"批次生成結束：成功 {done} 個，共 {len(self.jobs)} 個")
+
+    def done(self, result):
+        # 關閉視窗時取消並等待進行中的工作
+        if self.scheduler is not None:
+            self.scheduler.cancel()
+            self.scheduler.wait()
+            self.scheduler = None
+        super().done(result)
@@ -0,0 +1,113 @@
+# batch_jobs.py
+# 多專案批次生成：將已儲存的專案排入佇列，由排程器控制同時執行數量，失敗時自動重試
+# 不依賴 Qt，狀態變化透過 on_update 回呼通知（回呼在背景執行緒中呼叫）
+import os, threading
+from concurrent.futures import ThreadPoolExecutor
+
+import report_engine
+from report_engine import InvalidProjectError, GenerationCancelled
+
+PENDING = "等待中"
+RUNNING = "執行中"
+RETRYING = "重試中"
+DONE = "完成"
+FAILED = "失敗"
+CANCELLED = "已取消"
+
+
+class BatchJob:
+    def __init__(self, variant, project_name):
+        """
+        :param variant: report_variants 中的版本類別實例
+        :param project_name: 專案資料庫中的專案名稱
+        """
+        self.variant = variant
+        self.project_name = project_name
+        self.status = PENDING
+        self.attempts = 0
+        self.output_path = None
+        self.error = None
+
+
+def generate_saved_project(job, store, cancel_event, output_dir="", **options):
+    # 從資料庫讀取專案並生成，回傳輸出路徑（分冊時以「、」連接）；
+    # 每個工作從模板快取取得各自的 DocxTemplate，可安全地同時執行
+    info_fields = job.variant.info_fields
+    project_data = store.load_project(info_fields["id"], job.project_name, info_fields)
+    if project_data is None:
+        raise InvalidProjectError(f"找不到已儲存的專案：{job.project_name}")
+    output_paths = report_engine.generate_document_parts(
+        project_data, job.variant,
+        output_dir=output_dir,
+        cancel_event=cancel_event,
+        **options
+    )
+    return "、".join(output_paths)
+
+
+class JobScheduler:
+    def __init__(self, run_job, max_concurrent=2, max_retries=2, retry_delay=5, on_update=None):
+        """
+        :param run_job: run_job(job, cancel_event) 執行單一工作並回傳輸出路徑
+        :param max_concurrent: 同時執行的工作數
+        :param max_retries: 失敗後最多重試次數（資料不完整的專案不重試）
+        :param retry_delay: 重試前等待的秒數
+        :param on_update: on_update(job) 於工作狀態改變時呼叫
+        """
+        self.run_job = run_job
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.on_update = on_update
+        self.cancel_event = threading.Event()
+        self.pool = ThreadPoolExecutor(max_workers=max_concurrent)
+        self.futures = []
+
+    def submit(self, jobs):
+        for job in jobs:
+            self.futures.append(self.pool.submit(self._run, job))
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def wait(self):
+        self.pool.shutdown(wait=True)
+
+    def _set_status(self, job, status):
+        job.status = status
+        if self.on_update is not None:
+            self.on_update(job)
+
+    def _run(self, job):
+        while True:
+            if self.cancel_event.is_set():
+                self._set_status(job, CANCELLED)
+                return
+            job.attempts += 1
+            self._set_status(job, RUNNING)
+            try:
+                job.output_path = self.run_job(job, self.cancel_event)
+                job.error = None
+                self._set_status(job, DONE)
+                return
+            except GenerationCancelled:
+                self._set_status(job, CANCELLED)
+                return
+            except InvalidProjectError as e:
+                job.error = str(e)
+                self._set_status(job, FAILED)
+                return
+            except Exception as e:
+                job.error = str(e)
+                if job.attempts > self.max_retries:
+                    self._set_status(job, FAILED)
+                    return
+                self._set_status(job, RETRYING)
+                # 等待期間若被取消則立即結束
+                if self.cancel_event.wait(self.retry_delay):
+                    self._set_status(job, CANCELLED)
+                    return
+
+
+def default_photo_workers(max_concurrent):
+    # 多個工作同時執行時平分 CPU 核心
+    return max(1, (os.cpu_count() or 1) // max(1, max_concurrent))
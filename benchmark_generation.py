@@ -0,0 +1,228 @@
+# benchmark_generation.py
+# 生成流程的效能測試（不需視窗）：以隨機產生的 JPEG／PNG 照片與仿照 施工照片.docx、照片.docx 的模板，
+# 量測照片數量、原圖解析度與標註時間比例增加時各階段的耗時、最高記憶體與輸出大小
+#   python benchmark_generation.py
+#   python benchmark_generation.py --photos 20 100 300 --megapixels 12 48 --time-ratio 0 1 --burn-disc
+#   python benchmark_generation.py --variant station --json 結果.json
+# 每個測試案例在新的子程序中執行，最高記憶體（peak_rss）不受前一個案例影響；
+# 固定 --seed 時照片內容相同，可與先前的結果比較
+import sys, os, json, time, random, shutil, argparse, tempfile, statistics
+from itertools import product
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from PIL import Image, ImageFilter
+from docx import Document
+
+from report_variants import VARIANTS
+from report_engine import generate_document_parts, disc_folder_name
+from stage_timing import StageTimer, STAGES
+from memory_usage import peak_rss
+from generate_cli import positive_int
+
+FIXTURE_VARIANTS = 8     # 每種解析度產生的不同照片數，照片依序重複使用
+PNG_EVERY = 5            # 每 5 張中有 1 張為 PNG（無法直接複製、需重新編碼）
+ASPECT = (4, 3)
+
+
+def make_photo(path, megapixels, seed, fmt):
+    # 產生近似實景照片的圖片：模糊的雜訊加上漸層，JPEG 壓縮後的大小與實際照片相近
+    height = int((megapixels * 1_000_000 * ASPECT[1] / ASPECT[0]) ** 0.5)
+    width = height * ASPECT[0] // ASPECT[1]
+    rng = random.Random(seed)
+    small = (max(1, width // 16), max(1, height // 16))
+    channels = [Image.effect_noise(small, rng.randint(30, 90)) for _ in range(3)]
+    gradient = Image.linear_gradient("L").resize(small)
+    base = Image.merge("RGB", [Image.blend(channel, gradient, rng.random()) for channel in channels])
+    image = base.resize((width, height), Image.BILINEAR).filter(ImageFilter.GaussianBlur(1))
+    detail = Image.effect_noise((width, height), 20).convert("RGB")
+    image = Image.blend(image, detail, 0.15)
+    if fmt == "PNG":
+        image.save(path, format="PNG", compress_level=1)
+    else:
+        image.save(path, format="JPEG", quality=90)
+
+
+def make_fixtures(directory, megapixels, seed):
+    # 回傳 [照片路徑]；同一解析度的照片只產生一次
+    paths = []
+    for i in range(FIXTURE_VARIANTS):
+        fmt = "PNG" if i % PNG_EVERY == PNG_EVERY - 1 else "JPEG"
+        path = os.path.join(directory, f"fixture-{megapixels}mp-{i}.{fmt.lower()}")
+        if not os.path.exists(path):
+            make_photo(path, megapixels, seed * 1000 + i, fmt)
+        paths.append(path)
+    return paths
+
+
+def make_template(path, variant):
+    # 與正式模板相同的結構：每個項目一段「編號 內容 時間」加一張圖片
+    document = Document()
+    document.add_paragraph("{%p for item in items %}")
+    document.add_paragraph(f"{{{{ item['{variant.info_fields['id']}'] }}}} {{{{ item.內容 }}}} {{{{ item.時間 }}}}")
+    document.add_paragraph("{{ item.圖片 }}")
+    document.add_paragraph("{%p endfor %}")
+    document.save(path)
+
+
+def make_project(variant, photo_paths, count, time_ratio, seed):
+    # 標註時間的項目平均分布，time_ratio 為 0.5 時每兩張標註一張
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        items.append({
+            "施工說明": f"測試項目{i + 1}",
+            "時間": f"2024/{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}",
+            "圖片路徑": photo_paths[i % len(photo_paths)],
+            "標註時間": int((i + 1) * time_ratio) > int(i * time_ratio),
+        })
+    return {variant.info_fields["id"]: "BENCH", variant.info_fields["address"]: "測試地址", "items": items}
+
+
+def directory_size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    total = 0
+    for root, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return total
+
+
+def run_case(case):
+    """
+    在子程序中執行一次生成，回傳量測結果
+    :param case: 由 build_cases 產生的測試案例字典
+    """
+    variant = VARIANTS[case["variant"]]()
+    variant.template_path = case["template"]
+    variant.output_profile = variant.output_profile.replace(dpi=case["dpi"], quality=case["quality"])
+    project_data = make_project(variant, case["photo_paths"], case["photos"], case["time_ratio"], case["seed"])
+    output_dir = case["output_dir"]
+    timings = StageTimer()
+    start = time.perf_counter()
+    output_paths = generate_document_parts(
+        project_data, variant, case["chunk_size"],
+        output_dir=output_dir,
+        burn_disc=case["burn_disc"],
+        workers=case["workers"],
+        use_processes=case["processes"],
+        timings=timings
+    )
+    wall = time.perf_counter() - start
+    snapshot = timings.snapshot()
+    disc_dir = os.path.join(output_dir, disc_folder_name("BENCH", "測試地址"))
+    result = {
+        "wall_seconds": wall,
+        "stages": {name: seconds for name, (seconds, _) in snapshot["stages"].items()},
+        "counters": snapshot["counters"],
+        "peak_rss_bytes": peak_rss(),
+        "parts": len(output_paths),
+        "docx_bytes": sum(os.path.getsize(path) for path in output_paths),
+        "disc_bytes": directory_size(disc_dir) if case["burn_disc"] else 0,
+    }
+    shutil.rmtree(output_dir, ignore_errors=True)
+    return result
+
+
+def run_isolated(case):
+    # 每個案例使用新的子程序（spawn），避免模板快取、字型快取與最高記憶體互相影響
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+        return pool.submit(run_case, case).result()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="施工照片生成器效能測試")
+    parser.add_argument("--variant", choices=sorted(VARIANTS) + ["all"], default="all",
+                        help="版本：case 為案件版，station 為捷運版，all 為兩者")
+    parser.add_argument("--photos", type=int, nargs="+", default=[10, 50, 200], help="每份文檔的照片數")
+    parser.add_argument("--megapixels", type=float, nargs="+", default=[12, 24], help="原圖解析度（百萬像素）")
+    parser.add_argument("--time-ratio", type=float, nargs="+", default=[0.0, 0.5, 1.0],
+                        help="標註時間的照片比例（0～1）")
+    parser.add_argument("--burn-disc", action="store_true", help="同時輸出燒光碟照片")
+    parser.add_argument("--dpi", type=int, help="嵌入照片的解析度（預設依版本決定）")
+    parser.add_argument("--chunk-size", type=positive_int, help="每冊項目數（分冊輸出），預設不分冊")
+    parser.add_argument("--quality", type=int, help="嵌入照片的 JPEG 品質（預設依版本決定）")
+    parser.add_argument("--workers", type=int, help="同時處理的照片數（預設依 CPU 核心數）")
+    parser.add_argument("--processes", action="store_true", help="以子程序而非執行緒處理照片")
+    parser.add_argument("--repeat", type=int, default=1, help="每個案例執行的次數，取耗時的中位數")
+    parser.add_argument("--seed", type=int, default=1, help="產生測試照片與資料的亂數種子")
+    parser.add_argument("--fixtures-dir", help="測試照片與模板的存放目錄（預設為暫存目錄，結束後刪除）")
+    parser.add_argument("--json", help="將完整結果寫入 JSON 檔案")
+    return parser
+
+
+def build_cases(args, fixtures_dir):
+    variants = sorted(VARIANTS) if args.variant == "all" else [args.variant]
+    templates = {}
+    for name in variants:
+        templates[name] = os.path.join(fixtures_dir, f"template-{name}.docx")
+        make_template(templates[name], VARIANTS[name]())
+    cases = []
+    for name, megapixels, photos, time_ratio in product(variants, args.megapixels, args.photos, args.time_ratio):
+        cases.append({
+            "variant": name,
+            "template": templates[name],
+            "megapixels": megapixels,
+            "photos": photos,
+            "time_ratio": time_ratio,
+            "photo_paths": make_fixtures(fixtures_dir, megapixels, args.seed),
+            "seed": args.seed,
+            "burn_disc": args.burn_disc,
+            "dpi": args.dpi,
+            "chunk_size": args.chunk_size,
+            "quality": args.quality,
+            "workers": args.workers,
+            "processes": args.processes,
+            "output_dir": os.path.join(fixtures_dir, "output"),
+        })
+    return cases
+
+
+def median_run(runs):
+    # 以耗時的中位數那一次作為代表，各階段耗時與記憶體取自同一次執行
+    ordered = sorted(runs, key=lambda run: run["wall_seconds"])
+    return ordered[(len(ordered) - 1) // 2]
+
+
+def format_row(case, result):
+    stages = " ".join(f"{result['stages'].get(name, 0.0):7.2f}" for name in STAGES)
+    return (f"{case['variant']:<8}{case['megapixels']:>6g}{case['photos']:>7}{case['time_ratio']:>6.2f}"
+            f"{result['wall_seconds']:>9.2f} {stages}"
+            f"{(result['peak_rss_bytes'] or 0) / 1024 ** 2:>9.0f}{result['docx_bytes'] / 1024 ** 2:>9.1f}"
+            f"{result['disc_bytes'] / 1024 ** 2:>9.1f}")
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    fixtures_dir = args.fixtures_dir or tempfile.mkdtemp(prefix="benchmark-")
+    if not os.path.exists(fixtures_dir):
+        os.makedirs(fixtures_dir)
+    print(f"{'variant':<8}{'MP':>6}{'photos':>7}{'time':>6}{'wall(s)':>9} "
+          + " ".join(f"{name[:7]:>7}" for name in STAGES)
+          + f"{'peakMB':>9}{'docxMB':>9}{'discMB':>9}")
+    results = []
+    try:
+        for case in build_cases(args, fixtures_dir):
+            runs = [run_isolated(case) for _ in range(max(1, args.repeat))]
+            result = median_run(runs)
+            result["wall_seconds_all"] = [run["wall_seconds"] for run in runs]
+            if len(runs) > 1:
+                result["wall_seconds_stdev"] = statistics.stdev(result["wall_seconds_all"])
+            print(format_row(case, result), flush=True)
+            settings = {key: case[key] for key in ("variant", "megapixels", "photos", "time_ratio", "burn_disc",
+                                                   "dpi", "quality", "chunk_size", "workers", "processes",
+                                                   "seed")}
+            results.append({**settings, **result})
+    finally:
+        if args.fixtures_dir is None:
+            shutil.rmtree(fixtures_dir, ignore_errors=True)
+    print("各階段為所有執行緒耗時的總和（秒），同時處理時可能大於 wall；peak 為該案例子程序的最高記憶體（--processes 時不含照片處理子程序）")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"cpu_count": os.cpu_count(), "python": sys.version, "results": results},
+                      f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,85 @@
+# buffer_arena.py
+# 單次 render 使用的圖片緩衝區：
+#   處理後（縮放、標註時間）的 JPEG 放在記憶體中，超過 memory_budget 後改存於暫存檔；
+#   with 區塊結束（doc.save 完成）時全部關閉釋放，不會隨著生成次數累積
+import tempfile, threading
+from io import BytesIO
+
+from memory_usage import current_rss
+
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024  # 256 MB
+
+_stats_lock = threading.Lock()
+_stats = {
+    "open_arenas": 0,        # 尚未釋放的 arena 數
+    "live_buffers": 0,       # 尚未釋放的緩衝區數
+    "live_memory_bytes": 0,  # 存放於記憶體中的位元組數
+    "live_spooled_bytes": 0, # 存放於暫存檔中的位元組數
+    "peak_memory_bytes": 0,
+}
+
+
+def _update_stats(arenas=0, buffers=0, memory=0, spooled=0):
+    with _stats_lock:
+        _stats["open_arenas"] += arenas
+        _stats["live_buffers"] += buffers
+        _stats["live_memory_bytes"] += memory
+        _stats["live_spooled_bytes"] += spooled
+        _stats["peak_memory_bytes"] = max(_stats["peak_memory_bytes"], _stats["live_memory_bytes"])
+
+
+def stats():
+    """
+    回傳圖片緩衝區與程序記憶體的統計；連續生成多次後 live_* 應回到 0、rss 應維持平穩
+    """
+    with _stats_lock:
+        result = dict(_stats)
+    result["rss_bytes"] = current_rss()
+    return result
+
+
+class BufferArena:
+    def __init__(self, memory_budget=DEFAULT_MEMORY_BUDGET):
+        self.memory_budget = memory_budget
+        self.memory_bytes = 0
+        self.spooled_bytes = 0
+        self._buffers = []
+        self._lock = threading.Lock()
+        self._closed = False
+        _update_stats(arenas=1)
+
+    def buffer(self, data):
+        # 回傳內容為 data、已移至開頭的檔案物件；未超過預算時留在記憶體，否則寫入暫存檔
+        with self._lock:
+            in_memory = self.memory_bytes + len(data) <= self.memory_budget
+            if in_memory:
+                buffer = BytesIO(data)
+            else:
+                buffer = tempfile.TemporaryFile()
+                buffer.write(data)
+                buffer.seek(0)
+            self._buffers.append(buffer)
+            if in_memory:
+                self.memory_bytes += len(data)
+                _update_stats(buffers=1, memory=len(data))
+            else:
+                self.spooled_bytes += len(data)
+                _update_stats(buffers=1, spooled=len(data))
+        return buffer
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            for buffer in self._buffers:
+                buffer.close()
+            _update_stats(arenas=-1, buffers=-len(self._buffers),
+                          memory=-self.memory_bytes, spooled=-self.spooled_bytes)
+            self._buffers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
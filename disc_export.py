@@ -0,0 +1,106 @@
+# disc_export.py
+# 燒光碟用照片的輸出：已經是 RGB／灰階 JPEG 的原圖直接複製位元組（或建立硬連結），
+# 保留 EXIF 且不重新壓縮；只有 PNG、BMP、RGBA 等其他格式才重新編碼為 JPEG
+# 輸出在背景執行緒進行，可與文檔的照片處理、render 同時執行
+import os, shutil, zipfile
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+
+from image_loading import open_image
+from stage_timing import active_timer, use_timer, stage, count
+
+PASSTHROUGH_MODES = ("RGB", "L")
+
+
+def is_passthrough_jpeg(image_path):
+    # 只讀取檔頭判斷，不解碼整張圖
+    with open_image(image_path) as image:
+        return image.format == "JPEG" and image.mode in PASSTHROUGH_MODES
+
+
+def transcode_to_jpeg(image_path):
+    with open_image(image_path) as image:
+        if image.mode not in PASSTHROUGH_MODES:
+            image = image.convert('RGB')
+        image_bytes = BytesIO()
+        image.save(image_bytes, format='JPEG')
+    return image_bytes.getvalue()
+
+
+def export_photo(image_path, save_path, hardlink=False):
+    """
+    輸出單張照片至資料夾
+    :return: "link"、"copy" 或 "transcode"，表示實際採用的方式
+    """
+    if is_passthrough_jpeg(image_path):
+        if hardlink:
+            try:
+                if os.path.exists(save_path):
+                    os.remove(save_path)
+                os.link(image_path, save_path)
+                return "link"
+            except OSError:
+                pass  # 跨磁碟或檔案系統不支援時改為複製
+        shutil.copyfile(image_path, save_path)
+        return "copy"
+    with open(save_path, "wb") as f:
+        f.write(transcode_to_jpeg(image_path))
+    return "transcode"
+
+
+class DiscExporter:
+    def __init__(self, target, workers=2, hardlink=False):
+        """
+        :param target: 輸出位置；副檔名為 .zip 時寫入壓縮檔（不壓縮，直接存放），否則為資料夾
+        :param workers: 輸出至資料夾時同時複製的數量（寫入 zip 時固定為 1）
+        :param hardlink: 輸出至資料夾時，JPEG 原圖是否以硬連結取代複製
+        """
+        self.target = target
+        self.hardlink = hardlink
+        self.zip_file = None
+        if target.lower().endswith(".zip"):
+            parent = os.path.dirname(target)
+            if parent and not os.path.exists(parent):
+                os.makedirs(parent)
+            self.zip_file = zipfile.ZipFile(target, "w", zipfile.ZIP_STORED)
+            workers = 1
+        elif not os.path.exists(target):
+            os.makedirs(target)
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.futures = []
+        self.timer = active_timer()  # 輸出執行緒的耗時記錄到建立者的 StageTimer
+
+    def submit(self, image_path, filename):
+        self.futures.append(self.pool.submit(self._export, image_path, filename))
+
+    def _export(self, image_path, filename):
+        with use_timer(self.timer), stage("disc_copy"):
+            method = self._export_one(image_path, filename)
+            count(f"disc_photos_{method}")
+            if self.zip_file is None:
+                count("disc_bytes_written", os.path.getsize(os.path.join(self.target, filename)))
+            else:
+                count("disc_bytes_written", self.zip_file.getinfo(filename).file_size)
+            return method
+
+    def _export_one(self, image_path, filename):
+        if self.zip_file is None:
+            return export_photo(image_path, os.path.join(self.target, filename), self.hardlink)
+        if is_passthrough_jpeg(image_path):
+            self.zip_file.write(image_path, filename)
+            return "copy"
+        self.zip_file.writestr(filename, transcode_to_jpeg(image_path))
+        return "transcode"
+
+    def close(self, cancel=False):
+        """
+        等待所有照片輸出完成；有任何一張失敗時拋出該例外
+        :param cancel: 取消尚未開始的輸出（生成失敗或使用者取消時使用）
+        :return: 各照片採用的方式清單
+        """
+        self.pool.shutdown(wait=True, cancel_futures=cancel)
+        if self.zip_file is not None:
+            self.zip_file.close()
+        if cancel:
+            return []
+        return [future.result() for future in self.futures]
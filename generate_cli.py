@@ -0,0 +1,127 @@
+# generate_cli.py
+# 命令列（無視窗）生成文檔，可在伺服器或排程工作中批次執行：
+#   python generate_cli.py --variant case 專案1.json 專案2.json --output-dir 輸出
+#   python generate_cli.py --variant station --burn-disc 站別.json
+#   python generate_cli.py --variant case --saved "A001-台北市" "A002-新北市"
+# 專案 JSON 的格式與 save_current_project 儲存的內容相同，
+# 一個檔案可以是單一專案，也可以是專案陣列；加上 --saved 時改為讀取已儲存的專案名稱
+import sys, os, json, argparse
+
+from report_variants import VARIANTS
+from report_engine import generate_document_parts, GenerationError, disc_folder_name
+from photo_cache import PhotoCache, DEFAULT_MAX_BYTES
+from project_store import ProjectStore
+from output_profile import SUBSAMPLING_MODES
+import buffer_arena
+
+
+def load_projects(path):
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return data if isinstance(data, list) else [data]
+
+
+def positive_int(value):
+    # argparse 型別：大於 0 的整數
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"必須是大於 0 的整數：{value}")
+    return number
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="施工照片生成器（命令列版）")
+    parser.add_argument("projects", nargs="+", help="專案 JSON 檔案（或搭配 --saved 的專案名稱）")
+    parser.add_argument("--saved", action="store_true", help="從專案資料庫讀取指定名稱的專案")
+    parser.add_argument("--database", help="專案資料庫路徑（預設為使用者資料目錄下的 projects.db）")
+    parser.add_argument("--variant", choices=sorted(VARIANTS), default="case",
+                        help="版本：case 為案件版，station 為捷運版")
+    parser.add_argument("--template", help="模板檔案路徑（預設依版本決定）")
+    parser.add_argument("--output-dir", default="", help="輸出目錄")
+    parser.add_argument("--burn-disc", action="store_true", help="同時輸出燒光碟用的照片資料夾")
+    parser.add_argument("--disc-dir", help="燒光碟照片的輸出目錄（例如光碟映像的暫存目錄），預設為 --output-dir")
+    parser.add_argument("--disc-zip", action="store_true", help="燒光碟照片寫入 .zip 而非資料夾")
+    parser.add_argument("--disc-hardlink", action="store_true", help="JPEG 原圖以硬連結取代複製（需在同一磁碟）")
+    parser.add_argument("--workers", type=int, help="同時處理的照片數（預設依 CPU 核心數）")
+    parser.add_argument("--processes", action="store_true", help="以子程序而非執行緒處理照片")
+    parser.add_argument("--cache-dir", help="已處理照片的快取目錄（預設為使用者快取目錄）")
+    parser.add_argument("--cache-size-mb", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help="快取大小上限（MB）")
+    parser.add_argument("--no-cache", action="store_true", help="不使用已處理照片的快取")
+    parser.add_argument("--memory-budget-mb", type=int,
+                        help="處理後的圖片在記憶體中最多佔用的 MB 數，超過時改存暫存檔")
+    parser.add_argument("--dpi", type=int, help="嵌入照片的解析度（預設依版本決定，300 dpi）")
+    parser.add_argument("--jpeg-quality", type=int, help="嵌入照片的 JPEG 品質 1～95（預設 85）")
+    parser.add_argument("--progressive", action="store_true", default=None, help="嵌入照片輸出為漸進式 JPEG")
+    parser.add_argument("--subsampling", choices=SUBSAMPLING_MODES, help="嵌入照片的色度取樣（預設 4:2:0）")
+    parser.add_argument("--chunk-size", type=positive_int,
+                        help="每冊項目數：項目較多時分成多份文檔（檔名加上 -1of3 等冊數），預設不分冊")
+    parser.add_argument("--memory-stats", action="store_true", help="每份文檔生成後輸出記憶體統計")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    variant = VARIANTS[args.variant]()
+    if args.template:
+        variant.template_path = args.template
+    variant.output_profile = variant.output_profile.replace(
+        dpi=args.dpi, quality=args.jpeg_quality, progressive=args.progressive, subsampling=args.subsampling)
+    if args.output_dir and not os.path.exists(args.output_dir):
+        os.makedirs(args.output_dir)
+
+    cache = None
+    if not args.no_cache:
+        cache = PhotoCache(args.cache_dir, args.cache_size_mb * 1024 * 1024)
+
+    store = ProjectStore(args.database) if args.saved else None
+
+    failures = 0
+    for path in args.projects:
+        if store is not None:
+            project_data = store.load_project(variant.info_fields["id"], path, variant.info_fields)
+            if project_data is None:
+                print(f"找不到已儲存的專案：{path}", file=sys.stderr)
+                failures += 1
+                continue
+            projects = [project_data]
+        else:
+            try:
+                projects = load_projects(path)
+            except (OSError, ValueError) as e:
+                print(f"讀取專案檔案失敗：{path}：{e}", file=sys.stderr)
+                failures += 1
+                continue
+        for project_data in projects:
+            disc_target = None
+            if args.burn_disc and (args.disc_dir or args.disc_zip):
+                name = disc_folder_name(project_data.get(variant.info_fields["id"], ""),
+                                        project_data.get(variant.info_fields["address"], ""))
+                disc_target = os.path.join(args.disc_dir or args.output_dir, name + (".zip" if args.disc_zip else ""))
+            try:
+                output_paths = generate_document_parts(
+                    project_data, variant, args.chunk_size,
+                    output_dir=args.output_dir,
+                    burn_disc=args.burn_disc,
+                    cache=cache,
+                    workers=args.workers,
+                    use_processes=args.processes,
+                    disc_target=disc_target,
+                    disc_hardlink=args.disc_hardlink,
+                    memory_budget=args.memory_budget_mb * 1024 * 1024 if args.memory_budget_mb is not None else None
+                )
+                for output_path in output_paths:
+                    print(f"文檔已生成：{output_path}")
+                if args.memory_stats:
+                    print(json.dumps(buffer_arena.stats()))
+            except GenerationError as e:
+                print(f"{path}：{e}", file=sys.stderr)
+                failures += 1
+            except Exception as e:
+                print(f"{path}：生成文檔時出錯：{e}", file=sys.stderr)
+                failures += 1
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
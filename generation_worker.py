@@ -0,0 +1,47 @@
+# generation_worker.py
+# 在背景執行緒中生成文檔，避免主視窗在生成期間無回應
+import threading
+from PyQt5.QtCore import QThread, pyqtSignal
+
+import report_engine
+from report_engine import GenerationError, InvalidProjectError, GenerationCancelled
+
+
+class GenerationWorker(QThread):
+    progress = pyqtSignal(int, int)       # 已完成照片數, 總數
+    succeeded = pyqtSignal(str)           # 輸出的 .docx 路徑（分冊時每行一個）
+    failed = pyqtSignal(str, bool)        # 錯誤訊息, 是否為資料不完整的警告
+    cancelled = pyqtSignal()
+
+    def __init__(self, project_data, variant, parent=None, **options):
+        """
+        :param project_data: 專案資料快照（於主執行緒先行收集，背景執行時不再讀取畫面元件）
+        :param variant: 版本設定，提供 info_fields、get_output_filename、get_photo_dimensions
+        :param options: 其餘參數直接傳給 report_engine.generate_document_parts（含 chunk_size）
+        """
+        super().__init__(parent)
+        self.project_data = project_data
+        self.variant = variant
+        self.options = options
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            output_paths = report_engine.generate_document_parts(
+                self.project_data, self.variant,
+                progress=self.progress.emit,
+                cancel_event=self.cancel_event,
+                **self.options
+            )
+            self.succeeded.emit("\n".join(output_paths))
+        except GenerationCancelled:
+            self.cancelled.emit()
+        except InvalidProjectError as e:
+            self.failed.emit(str(e), True)
+        except GenerationError as e:
+            self.failed.emit(str(e), False)
+        except Exception as e:
+            self.failed.emit(f"生成文檔時出錯：{e}", False)
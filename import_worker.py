@@ -0,0 +1,26 @@
+# import_worker.py
+# 在背景執行緒中讀取要匯入照片的 EXIF 並排序，避免匯入大量照片時主視窗無回應
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from photo_import import list_images, read_photo_infos, item_from_info
+
+
+class PhotoImportWorker(QThread):
+    loaded = pyqtSignal(list)             # 依拍攝時間排序的項目資料
+    failed = pyqtSignal(str)              # 錯誤訊息
+
+    def __init__(self, paths=None, folder=None, parent=None):
+        """
+        :param paths: 多選的圖片路徑
+        :param folder: 匯入整個資料夾的圖片（指定時忽略 paths）
+        """
+        super().__init__(parent)
+        self.paths = paths or []
+        self.folder = folder
+
+    def run(self):
+        try:
+            paths = list_images(self.folder) if self.folder else self.paths
+            self.loaded.emit([item_from_info(info) for info in read_photo_infos(paths)])
+        except Exception as e:
+            self.failed.emit(f"匯入照片時出錯：{e}")
@@ -0,0 +1,116 @@
+# instrumentation.py
+# 效能記錄：生成文檔、讀取與儲存專案的耗時（span）寫入使用者資料目錄下的 logs/timings.jsonl，
+# 每行一筆 JSON，檔案超過 LOG_MAX_BYTES 時輪替，使用者回報「生成很慢」時可直接寄回此檔案分析
+# 設定環境變數 CONSTRUCTION_PROFILE=1（或在主視窗勾選「記錄效能分析」）時，
+# 另以 cProfile 分析每次生成並將 .prof 檔存於同一目錄
+import os, json, time, logging, threading, cProfile
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+
+from app_paths import user_data_dir
+from stage_timing import use_timer
+
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+PROFILE_ENV = "CONSTRUCTION_PROFILE"
+
+_logger = None
+_logger_lock = threading.Lock()
+_profiling = os.environ.get(PROFILE_ENV, "") not in ("", "0")
+# cProfile 同一時間只能有一個在執行（Python 3.12 起為整個程序共用），批次同時生成時只分析第一個
+_profile_lock = threading.Lock()
+
+
+def log_dir():
+    return user_data_dir("logs")
+
+
+class _JsonLinesFormatter(logging.Formatter):
+    def format(self, record):
+        return json.dumps(record.fields, ensure_ascii=False, default=str)
+
+
+def _get_logger():
+    global _logger
+    with _logger_lock:
+        if _logger is None:
+            logger = logging.getLogger("construction.timings")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            try:
+                os.makedirs(log_dir(), exist_ok=True)
+                handler = RotatingFileHandler(os.path.join(log_dir(), "timings.jsonl"), maxBytes=LOG_MAX_BYTES,
+                                              backupCount=LOG_BACKUP_COUNT, encoding="utf-8")
+            except OSError:
+                handler = logging.NullHandler()  # 無法寫入時不影響主要功能
+            handler.setFormatter(_JsonLinesFormatter())
+            logger.addHandler(handler)
+            _logger = logger
+        return _logger
+
+
+def log_event(event, **fields):
+    # 寫入一筆記錄；fields 需可轉為 JSON（其他型別以 str() 表示）
+    record = {"ts": round(time.time(), 3), "event": event, "pid": os.getpid(),
+              "thread": threading.current_thread().name, **fields}
+    _get_logger().info(event, extra={"fields": record})
+
+
+def set_profiling(enabled):
+    global _profiling
+    _profiling = enabled
+
+
+def profiling_enabled():
+    return _profiling
+
+
+@contextmanager
+def span(name, timer=None, profile=False, **fields):
+    """
+    記錄 with 區塊的耗時與結果（ok 或 error），區塊內可修改 yield 出的 fields 補充資訊
+    :param timer: 若指定 StageTimer，區塊內的 stage()／count() 記錄到此物件，結束時一併寫入各階段耗時與計數
+    :param profile: 開啟效能分析時是否以 cProfile 分析此區塊
+    """
+    profiler = None
+    if profile and _profiling and _profile_lock.acquire(blocking=False):
+        profiler = cProfile.Profile()
+    status = "ok"
+    start = time.perf_counter()
+    try:
+        if profiler is not None:
+            profiler.enable()
+        if timer is None:
+            yield fields
+        else:
+            with use_timer(timer):
+                yield fields
+    except BaseException as e:
+        status = "error"
+        fields["error_type"] = type(e).__name__  # 使用者取消時為 GenerationCancelled
+        fields["error"] = str(e)
+        raise
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if profiler is not None:
+            profiler.disable()
+            _profile_lock.release()
+            fields["profile"] = _dump_profile(profiler, name)
+        if timer is not None:
+            snapshot = timer.snapshot()
+            fields["stages"] = {stage_name: {"ms": round(seconds * 1000, 1), "count": count}
+                                for stage_name, (seconds, count) in snapshot["stages"].items()}
+            fields["counters"] = snapshot["counters"]
+        log_event("span", name=name, ms=round(elapsed_ms, 1), status=status, **fields)
+
+
+def _dump_profile(profiler, name):
+    # cProfile 只分析呼叫 span 的執行緒；照片處理池中的工作請參考 stages 中的耗時
+    path = os.path.join(log_dir(), f"profile-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{name}.prof")
+    try:
+        os.makedirs(log_dir(), exist_ok=True)
+        profiler.dump_stats(path)
+    except OSError:
+        return None
+    return path
+
@@ -0,0 +1,312 @@
+# item_list.py
+# 施工項目清單（model/view）：
+#   ProjectItemModel 保存所有項目的資料，不為每一列建立元件；
+#   ItemListView 只為畫面上看得到的列開啟 FormItemWidget 編輯器，捲動時再關閉看不到的；
+#   預覽縮圖在背景執行緒解碼，完成後才顯示；
+#   model 記錄自上次儲存後有變動的位置，自動儲存時只寫入這些項目
+import json
+from PyQt5.QtWidgets import QListView, QStyledItemDelegate, QAbstractItemView, QStyle
+from PyQt5.QtGui import QPixmap
+from PyQt5.QtCore import (
+    Qt, QAbstractListModel, QModelIndex, QPersistentModelIndex, QMimeData,
+    QObject, QRunnable, QThreadPool, QTimer, QPoint, pyqtSignal
+)
+
+from widgets import FormItemWidget, PREVIEW_SIZE
+from pixmap_cache import load_scaled_image, find_pixmap, insert_pixmap
+
+ITEM_DATA_ROLE = Qt.UserRole
+ROWS_MIME_TYPE = "application/x-construction-item-rows"
+
+
+def empty_item():
+    return {'施工說明': '', '時間': '', '圖片路徑': '', '標註時間': False}
+
+
+class _ThumbnailSignals(QObject):
+    loaded = pyqtSignal(str, object)  # 圖片路徑, QImage
+
+
+class _ThumbnailTask(QRunnable):
+    def __init__(self, path, signals):
+        super().__init__()
+        self.path = path
+        self.signals = signals
+
+    def run(self):
+        self.signals.loaded.emit(self.path, load_scaled_image(self.path, *PREVIEW_SIZE))
+
+
+class ProjectItemModel(QAbstractListModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._items = []
+        self._dirty = set()       # 自上次儲存後新增、修改或因插入／刪除／排序而移動的位置
+        self._saved_count = 0     # 上次儲存時的項目數
+        self._pending = set()     # 正在背景解碼的圖片路徑
+        self._failed = set()      # 無法解碼的圖片路徑，不再重試
+        self._thumbnail_signals = _ThumbnailSignals()
+        self._thumbnail_signals.loaded.connect(self._on_thumbnail_loaded)
+        # 縮圖使用專屬的執行緒池：QPixmap.fromImage 轉換大圖時會把工作切段排入 Qt 的全域執行緒池並等待完成，
+        # 若縮圖工作也排在全域池中，會與等待中的主執行緒互相卡住（GIL），整個畫面停止回應
+        self._thumbnail_pool = QThreadPool(self)
+
+    # ---- 專案資料 ----
+    def items(self):
+        return [dict(item) for item in self._items]
+
+    def set_items(self, items):
+        # 載入專案：內容與資料庫相同，視為已儲存
+        self.beginResetModel()
+        self._items = [dict(empty_item(), **item) for item in items]
+        self._dirty.clear()
+        self._saved_count = len(self._items)
+        self._failed.clear()
+        self.endResetModel()
+
+    def append_item(self, item_data=None):
+        row = len(self._items)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._items.append(dict(empty_item(), **(item_data or {})))
+        self._dirty.add(row)
+        self.endInsertRows()
+
+    def append_items(self, items):
+        # 一次加入多個項目（批次匯入），只發出一次 rowsInserted
+        if not items:
+            return
+        row = len(self._items)
+        self.beginInsertRows(QModelIndex(), row, row + len(items) - 1)
+        self._items.extend(dict(empty_item(), **item) for item in items)
+        self._dirty.update(range(row, len(self._items)))
+        self.endInsertRows()
+
+    # ---- 變動記錄 ----
+    def has_changes(self):
+        return bool(self._dirty) or len(self._items) != self._saved_count
+
+    def take_changes(self):
+        """
+        回傳 ({位置: 項目資料}, 目前項目數) 並視為已儲存，供 ProjectStore.save_items 使用
+        """
+        changed = {row: dict(self._items[row]) for row in self._dirty if row < len(self._items)}
+        self._dirty.clear()
+        self._saved_count = len(self._items)
+        return changed, len(self._items)
+
+    def mark_all_dirty(self):
+        # 自動儲存失敗時呼叫：資料庫內容不確定，所有項目都視為未儲存
+        self._dirty = set(range(len(self._items)))
+        self._saved_count = -1
+
+    def _mark_from(self, row):
+        # row 之後的項目位置都改變了
+        self._dirty.update(range(row, len(self._items)))
+
+    # ---- QAbstractListModel ----
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._items)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._items):
+            return None
+        item = self._items[index.row()]
+        if role == Qt.DisplayRole:
+            return item['施工說明']
+        if role == ITEM_DATA_ROLE:
+            return dict(item)
+        if role == Qt.DecorationRole:
+            return self.thumbnail(item['圖片路徑'])
+        return None
+
+    def setData(self, index, value, role=ITEM_DATA_ROLE):
+        if role != ITEM_DATA_ROLE or not index.isValid():
+            return False
+        if self._items[index.row()] == value:
+            return True
+        self._items[index.row()] = dict(value)
+        self._dirty.add(index.row())
+        self.dataChanged.emit(index, index, [role, Qt.DisplayRole])
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemIsDropEnabled
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable | Qt.ItemIsDragEnabled
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        if parent.isValid() or row < 0 or row + count > len(self._items):
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        del self._items[row:row + count]
+        self._mark_from(row)
+        self.endRemoveRows()
+        return True
+
+    def moveRows(self, source_parent, source_row, count, dest_parent, dest_child):
+        if source_parent.isValid() or dest_parent.isValid():
+            return False
+        if source_row <= dest_child <= source_row + count:
+            return False
+        if not self.beginMoveRows(source_parent, source_row, source_row + count - 1, dest_parent, dest_child):
+            return False
+        moved = self._items[source_row:source_row + count]
+        del self._items[source_row:source_row + count]
+        insert_at = dest_child - count if dest_child > source_row else dest_child
+        self._items[insert_at:insert_at] = moved
+        self._dirty.update(range(min(source_row, insert_at), max(source_row, insert_at) + count))
+        self.endMoveRows()
+        return True
+
+    # ---- 拖曳排序 ----
+    def supportedDropActions(self):
+        return Qt.MoveAction
+
+    def mimeTypes(self):
+        return [ROWS_MIME_TYPE]
+
+    def mimeData(self, indexes):
+        mime = QMimeData()
+        rows = sorted({index.row() for index in indexes})
+        mime.setData(ROWS_MIME_TYPE, json.dumps([self._items[row] for row in rows]).encode("utf-8"))
+        return mime
+
+    def dropMimeData(self, data, action, row, column, parent):
+        if action == Qt.IgnoreAction:
+            return True
+        if not data.hasFormat(ROWS_MIME_TYPE):
+            return False
+        items = json.loads(bytes(data.data(ROWS_MIME_TYPE)).decode("utf-8"))
+        if row < 0:
+            row = parent.row() if parent.isValid() else len(self._items)
+        self.beginInsertRows(QModelIndex(), row, row + len(items) - 1)
+        self._items[row:row] = items
+        self._mark_from(row)
+        self.endInsertRows()
+        return True
+
+    # ---- 預覽縮圖 ----
+    def thumbnail(self, path):
+        # 共用快取中已有則回傳 QPixmap；否則排入背景解碼並回傳 None，完成後發出 dataChanged
+        if not path or path in self._failed:
+            return None
+        pixmap = find_pixmap(path, *PREVIEW_SIZE)
+        if pixmap is None and path not in self._pending:
+            self._pending.add(path)
+            self._thumbnail_pool.start(_ThumbnailTask(path, self._thumbnail_signals))
+        return pixmap
+
+    def _on_thumbnail_loaded(self, path, image):
+        self._pending.discard(path)
+        if image.isNull():
+            self._failed.add(path)
+            return
+        insert_pixmap(path, *PREVIEW_SIZE, QPixmap.fromImage(image))
+        for row, item in enumerate(self._items):
+            if item['圖片路徑'] == path:
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+
+class ItemDelegate(QStyledItemDelegate):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._size_hint = None
+
+    def createEditor(self, parent, option, index):
+        editor = FormItemWidget(parent=parent)
+        editor.changed.connect(lambda: self.commitData.emit(editor))
+        return editor
+
+    def setEditorData(self, editor, index):
+        item_data = index.data(ITEM_DATA_ROLE)
+        if editor.get_data() != item_data:
+            editor.set_data(item_data, load_preview=False)
+        path = item_data['圖片路徑']
+        pixmap = index.data(Qt.DecorationRole)
+        if pixmap is not None and editor.image_preview_label.property("image_path") != path:
+            editor.set_preview_pixmap(path, pixmap)
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.get_data(), ITEM_DATA_ROLE)
+
+    def updateEditorGeometry(self, editor, option, index):
+        editor.setGeometry(option.rect)
+
+    def sizeHint(self, option, index):
+        # 所有列高度相同，以一個編輯器樣本計算一次
+        if self._size_hint is None:
+            sample = FormItemWidget()
+            self._size_hint = sample.sizeHint()
+            sample.deleteLater()
+        return self._size_hint
+
+    def paint(self, painter, option, index):
+        # 可見的列都會被編輯器覆蓋，此處只在編輯器建立前短暫顯示說明文字
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+        painter.drawText(option.rect.adjusted(10, 10, -10, -10), Qt.AlignLeft | Qt.AlignTop,
+                         index.data(Qt.DisplayRole) or "")
+
+
+class ItemListView(QListView):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setItemDelegate(ItemDelegate(self))
+        self.setUniformItemSizes(True)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.setDragDropMode(QAbstractItemView.InternalMove)
+        self.setDefaultDropAction(Qt.MoveAction)
+        self._open_editors = []   # 已開啟編輯器的 QPersistentModelIndex
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.timeout.connect(self.update_visible_editors)
+        self.verticalScrollBar().valueChanged.connect(self.schedule_editor_update)
+
+    def setModel(self, model):
+        super().setModel(model)
+        for signal in (model.modelReset, model.rowsInserted, model.rowsRemoved, model.rowsMoved, model.layoutChanged):
+            signal.connect(self.schedule_editor_update)
+        self.schedule_editor_update()
+
+    def schedule_editor_update(self, *args):
+        self._update_timer.start(0)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.schedule_editor_update()
+
+    def visible_rows(self):
+        model = self.model()
+        if model is None or model.rowCount() == 0:
+            return range(0)
+        first = self.indexAt(QPoint(0, 0)).row()
+        last = self.indexAt(QPoint(0, self.viewport().height() - 1)).row()
+        if first < 0:
+            first = 0
+        if last < 0:
+            last = model.rowCount() - 1
+        # 上下各多保留一列，捲動時不會看到空白
+        return range(max(first - 1, 0), min(last + 2, model.rowCount()))
+
+    def update_visible_editors(self):
+        model = self.model()
+        if model is None:
+            return
+        rows = set(self.visible_rows())
+        still_open = []
+        for persistent in self._open_editors:
+            if not persistent.isValid():
+                continue
+            index = model.index(persistent.row())
+            if persistent.row() in rows:
+                still_open.append(persistent)
+            else:
+                self.closePersistentEditor(index)
+        open_rows = {persistent.row() for persistent in still_open}
+        for row in rows - open_rows:
+            index = model.index(row)
+            self.openPersistentEditor(index)
+            still_open.append(QPersistentModelIndex(index))
+        self._open_editors = still_open
@@ -1,9 +1,12 @@
 # main.py
 import sys
-from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QTabWidget
+from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QTabWidget, QPushButton, QCheckBox, QMessageBox
 
 from app_functionality import ConstructionApp       # 案件版
 from MRT_project import ConstructionAppStation        # 捷運版
+from batch_dialog import BatchDialog
+from project_store import default_store
+import instrumentation
 
 class MainWindow(QWidget):
     def __init__(self):
@@ -23,24 +26,50 @@ class MainWindow(QWidget):
         self.tabs.addTab(self.mrt_tab, "捷運版")
         
         layout.addWidget(self.tabs)
+        
+        # 批次生成：一次處理多個已儲存的專案（案件版與捷運版皆可）
+        bottom_layout = QHBoxLayout()
+        self.batch_button = QPushButton("批次生成")
+        self.batch_button.clicked.connect(self.open_batch_dialog)
+        bottom_layout.addWidget(self.batch_button, stretch=1)
+        
+        # 效能分析：勾選後每次生成以 cProfile 分析，結果存於效能記錄目錄
+        self.profile_checkbox = QCheckBox("記錄效能分析")
+        self.profile_checkbox.setChecked(instrumentation.profiling_enabled())
+        self.profile_checkbox.setToolTip(f"分析結果與效能記錄存於 {instrumentation.log_dir()}")
+        self.profile_checkbox.toggled.connect(instrumentation.set_profiling)
+        bottom_layout.addWidget(self.profile_checkbox)
+        layout.addLayout(bottom_layout)
         self.setLayout(layout)
         self.setWindowTitle("施工照片生成器")
     
-    def closeEvent(self, event):
-        current_index = self.tabs.currentIndex()
-        # 0 表示第一個分頁（案件版），1 表示第二個分頁（捷運版）
-        if current_index == 0:
-            # 儲存案件版
-            try:
-                self.case_tab.save_current_project()
-            except Exception as e:
-                print("案件版存檔錯誤：", e)
-        else:
-            # 儲存捷運版
+    def open_batch_dialog(self):
+        # 先寫入兩個分頁尚未儲存的變更，確保批次清單與生成的文檔包含最新內容
+        for tab, label in ((self.case_tab, "案件版"), (self.mrt_tab, "捷運版")):
             try:
-                self.mrt_tab.save_current_project()
+                tab.flush_autosave()
             except Exception as e:
-                print("捷運版存檔錯誤：", e)
+                QMessageBox.critical(self, "錯誤", f"{label}存檔錯誤：{e}")
+                return
+        dialog = BatchDialog(default_store(), self)
+        dialog.exec_()
+    
+    def closeEvent(self, event):
+        # 先停止兩個分頁中進行中的背景生成
+        self.case_tab.wait_for_generation()
+        self.mrt_tab.wait_for_generation()
+        
+        # 寫入兩個分頁尚未儲存的變更（只寫入有變動的項目）
+        try:
+            self.case_tab.flush_autosave()
+        except Exception as e:
+            print("案件版存檔錯誤：", e)
+        try:
+            self.mrt_tab.flush_autosave()
+        except Exception as e:
+            print("捷運版存檔錯誤：", e)
+        self.case_tab.autosaver.shutdown()
+        self.mrt_tab.autosaver.shutdown()
     
         event.accept()
 
@@ -0,0 +1,49 @@
+# output_profile.py
+# 嵌入文檔的照片輸出設定：依 get_photo_dimensions 的尺寸（公分）與 dpi 縮放後以 JPEG 重新壓縮，
+# 標註時間與未標註時間的照片都適用；燒光碟用的照片仍為原圖，不受此設定影響
+# 預設以 300 dpi 列印為準：10 x 6.5 cm 約為 1181 x 768 像素，原本 1024 dpi 時約為 4031 x 2620 像素
+
+SUBSAMPLING_MODES = ("4:4:4", "4:2:2", "4:2:0")
+
+
+class OutputProfile:
+    def __init__(self, dpi=300, quality=85, progressive=False, optimize=True, subsampling="4:2:0"):
+        """
+        :param dpi: 照片在文檔中的解析度（每英吋像素數）
+        :param quality: JPEG 品質（1～95）
+        :param progressive: 是否輸出漸進式 JPEG（檔案略小，Word 顯示時逐步載入）
+        :param optimize: 是否最佳化霍夫曼表（檔案較小，壓縮稍慢）
+        :param subsampling: 色度取樣 "4:4:4"、"4:2:2" 或 "4:2:0"；4:2:0 最小，照片上幾乎看不出差異
+        """
+        if subsampling not in SUBSAMPLING_MODES:
+            raise ValueError(f"不支援的色度取樣：{subsampling}")
+        self.dpi = dpi
+        self.quality = quality
+        self.progressive = progressive
+        self.optimize = optimize
+        self.subsampling = subsampling
+
+    def replace(self, **changes):
+        # 回傳修改部分設定後的新設定，例如命令列參數覆寫版本預設值
+        settings = dict(vars(self))
+        settings.update({key: value for key, value in changes.items() if value is not None})
+        return OutputProfile(**settings)
+
+    def pixel_size(self, width_cm, height_cm):
+        return int(width_cm * self.dpi / 2.54), int(height_cm * self.dpi / 2.54)
+
+    def jpeg_options(self):
+        # PIL Image.save(format="JPEG") 的參數
+        return {
+            "quality": self.quality,
+            "progressive": self.progressive,
+            "optimize": self.optimize,
+            "subsampling": self.subsampling,
+        }
+
+    def cache_params(self):
+        # 供 photo_cache 快取鍵使用，任何設定改變都會重新處理照片
+        return {"dpi": self.dpi, **self.jpeg_options()}
+
+
+DEFAULT_OUTPUT_PROFILE = OutputProfile()
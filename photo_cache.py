@@ -0,0 +1,77 @@
+# photo_cache.py
+# 已處理照片（依輸出設定縮放、標註時間後的 JPEG）的磁碟快取
+# 以來源檔案與處理參數組成快取鍵，內容未變的照片重新生成時不需再次縮放與編碼
+import os, json, hashlib, threading
+
+from app_paths import user_cache_dir
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024  # 1 GB
+
+
+class PhotoCache:
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        :param cache_dir: 快取目錄，預設為使用者快取目錄下的 photo_cache
+        :param max_bytes: 快取總大小上限，超過時依最近使用時間淘汰（LRU）
+        """
+        self.cache_dir = cache_dir or user_cache_dir("photo_cache")
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def make_key(self, image_path, **params):
+        # 來源檔案以絕對路徑、大小與修改時間識別；params 為尺寸、dpi、時間文字、字型等處理參數
+        stat = os.stat(image_path)
+        source = [os.path.abspath(image_path), stat.st_size, stat.st_mtime_ns]
+        raw = json.dumps([source, sorted(params.items())], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + ".jpg")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # 更新使用時間供 LRU 淘汰判斷
+        except OSError:
+            return None
+        return data
+
+    def put(self, key, data):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            # 快取寫入失敗不影響生成結果
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def trim(self):
+        # 依最近使用時間由舊到新刪除，直到總大小不超過 max_bytes
+        entries = []
+        total = 0
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".jpg"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
@@ -0,0 +1,59 @@
+# photo_import.py
+# 批次匯入照片：讀取 EXIF 的拍攝時間（DateTimeOriginal）預先填入「時間」，依拍攝時間排序後建立項目
+# （EXIF 方向於預覽與生成文檔時套用，見 pixmap_cache 與 image_loading）
+# 只讀取檔頭，不解碼整張圖；多張照片以執行緒池同時讀取。不依賴 Qt，可在背景執行緒呼叫
+import os
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+TIME_FORMAT = "%Y/%m/%d"  # 填入「時間」欄位的格式
+
+EXIF_IFD = 0x8769
+TAG_DATETIME = 0x0132
+TAG_DATETIME_ORIGINAL = 0x9003
+EXIF_TIME_FORMAT = "%Y:%m:%d %H:%M:%S"
+
+
+def list_images(folder):
+    # 資料夾中的圖片（不含子資料夾），依檔名排序
+    names = sorted(name for name in os.listdir(folder) if name.lower().endswith(IMAGE_EXTENSIONS))
+    return [os.path.join(folder, name) for name in names]
+
+
+def read_photo_info(path):
+    """
+    :return: {"path", "taken": 拍攝時間 datetime 或 None}
+    """
+    taken = None
+    try:
+        with Image.open(path) as image:
+            exif = image.getexif()
+            # DateTimeOriginal 在 Exif 子目錄中；沒有時改用主目錄的 DateTime（最後修改時間）
+            value = exif.get_ifd(EXIF_IFD).get(TAG_DATETIME_ORIGINAL) or exif.get(TAG_DATETIME)
+            if value:
+                taken = datetime.strptime(str(value).strip("\x00 "), EXIF_TIME_FORMAT)
+    except (OSError, ValueError, SyntaxError):
+        pass  # 無法讀取或格式不符時不填時間，照片仍會匯入
+    return {"path": path, "taken": taken}
+
+
+def read_photo_infos(paths, workers=None):
+    """
+    同時讀取多張照片的 EXIF，結果依拍攝時間排序（沒有拍攝時間的排在最後，依檔名排序）
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        infos = list(pool.map(read_photo_info, paths))
+    return sorted(infos, key=lambda info: (info["taken"] is None, info["taken"] or datetime.min,
+                                           os.path.basename(info["path"]).lower()))
+
+
+def item_from_info(info):
+    # 與 item_list.empty_item 相同的欄位
+    return {
+        '施工說明': '',
+        '時間': info["taken"].strftime(TIME_FORMAT) if info["taken"] else '',
+        '圖片路徑': info["path"],
+        '標註時間': False,
+    }
@@ -0,0 +1,64 @@
+# pixmap_cache.py
+# 全程式共用的預覽／放大圖快取（QPixmapCache），有記憶體上限，超過時自動淘汰最久未用的圖
+# 快取鍵包含路徑、尺寸與檔案修改時間，案件版與捷運版使用同一張照片時可共用
+import os
+from PyQt5.QtGui import QPixmap, QPixmapCache, QImageReader, QImageIOHandler
+from PyQt5.QtCore import Qt
+
+PIXMAP_CACHE_LIMIT_KB = 256 * 1024  # 256 MB
+
+_limit_applied = False
+
+def _ensure_limit():
+    global _limit_applied
+    if not _limit_applied:
+        QPixmapCache.setCacheLimit(PIXMAP_CACHE_LIMIT_KB)
+        _limit_applied = True
+
+def cache_key(path, width, height):
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime = 0
+    return f"{path}|{width}x{height}|{mtime}"
+
+def load_scaled_image(path, width, height):
+    # 以 QImageReader 在解碼時直接縮小到 width x height 以內（保持比例），不先載入整張原圖
+    # 依 EXIF 方向轉正；回傳 QImage，可在背景執行緒中呼叫
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    if reader.transformation() & QImageIOHandler.TransformationRotate90:
+        # 縮放在轉正之前進行，範圍需以轉正前的方向計算
+        width, height = height, width
+    size = reader.size()
+    if size.isValid() and (size.width() > width or size.height() > height):
+        size.scale(width, height, Qt.KeepAspectRatio)
+        reader.setScaledSize(size)
+    return reader.read()
+
+def load_scaled_pixmap(path, width, height):
+    image = load_scaled_image(path, width, height)
+    if image.isNull():
+        return QPixmap()
+    return QPixmap.fromImage(image)
+
+def find_pixmap(path, width, height):
+    # 只查詢快取，未命中回傳 None（只能在主執行緒呼叫）
+    _ensure_limit()
+    pixmap = QPixmapCache.find(cache_key(path, width, height))
+    if pixmap is None or pixmap.isNull():
+        return None
+    return pixmap
+
+def insert_pixmap(path, width, height, pixmap):
+    _ensure_limit()
+    if not pixmap.isNull():
+        QPixmapCache.insert(cache_key(path, width, height), pixmap)
+
+def cached_pixmap(path, width, height):
+    # 先查快取，未命中時同步解碼並放入快取
+    pixmap = find_pixmap(path, width, height)
+    if pixmap is None:
+        pixmap = load_scaled_pixmap(path, width, height)
+        insert_pixmap(path, width, height, pixmap)
+    return pixmap
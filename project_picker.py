@@ -0,0 +1,149 @@
+# project_picker.py
+# 專案選擇器：輸入編號或地址的開頭即時篩選，結果依最後修改時間排序
+# 資料直接從 project_store 的索引查詢，並在捲動時分頁載入，啟動時不需讀取所有專案
+import time
+from PyQt5.QtWidgets import QLineEdit, QListView, QAbstractItemView
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QTimer, QPoint, pyqtSignal
+
+PAGE_SIZE = 100
+POPUP_MAX_HEIGHT = 400
+
+
+class ProjectPickerModel(QAbstractListModel):
+    def __init__(self, store, namespace, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.namespace = namespace
+        self.filter_text = ""
+        self._rows = []           # [(名稱, 編號, 地址, 修改時間)]
+        self._exhausted = False
+
+    def set_filter(self, text):
+        self.beginResetModel()
+        self.filter_text = text
+        self._rows = []
+        self._exhausted = False
+        self.endResetModel()
+        self.fetchMore(QModelIndex())
+
+    def refresh(self):
+        self.set_filter(self.filter_text)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent):
+        if not self.canFetchMore(parent):
+            return
+        page = self.store.search_projects(self.namespace, self.filter_text, PAGE_SIZE, len(self._rows))
+        if len(page) < PAGE_SIZE:
+            self._exhausted = True
+        if page:
+            self.beginInsertRows(QModelIndex(), len(self._rows), len(self._rows) + len(page) - 1)
+            self._rows.extend(page)
+            self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        name, id_value, address_value, modified_at = self._rows[index.row()]
+        if role in (Qt.DisplayRole, Qt.UserRole):
+            return name
+        if role == Qt.ToolTipRole:
+            return f"最後修改：{time.strftime('%Y-%m-%d %H:%M', time.localtime(modified_at))}"
+        return None
+
+
+class ProjectPicker(QLineEdit):
+    project_chosen = pyqtSignal(str)
+
+    def __init__(self, store, namespace, placeholder, parent=None):
+        super().__init__(parent)
+        self.setPlaceholderText(placeholder)
+        self.setClearButtonEnabled(True)
+        self.current_name = None
+        self.model = ProjectPickerModel(store, namespace, self)
+
+        # 下拉清單不取得焦點，輸入仍留在文字框中
+        self.popup = QListView()
+        self.popup.setWindowFlags(Qt.ToolTip)
+        self.popup.setFocusPolicy(Qt.NoFocus)
+        self.popup.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.popup.setUniformItemSizes(True)
+        self.popup.setModel(self.model)
+        self.popup.clicked.connect(self.choose)
+
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(150)
+        self._filter_timer.timeout.connect(self.apply_filter)
+        self.textEdited.connect(lambda text: self._filter_timer.start())
+
+    def current_project(self):
+        return self.current_name
+
+    def set_current(self, name):
+        self.current_name = name
+        self.setText(name or "")
+
+    def refresh(self):
+        self.model.refresh()
+
+    def apply_filter(self):
+        self.model.set_filter(self.text())
+        self.show_popup()
+
+    def show_popup(self):
+        rows = self.model.rowCount()
+        if rows == 0:
+            self.popup.hide()
+            return
+        row_height = self.popup.sizeHintForRow(0)
+        self.popup.setFixedSize(self.width(), min(POPUP_MAX_HEIGHT, row_height * rows + 4))
+        self.popup.move(self.mapToGlobal(QPoint(0, self.height())))
+        self.popup.setCurrentIndex(self.model.index(0))
+        self.popup.show()
+
+    def choose(self, index):
+        name = index.data(Qt.UserRole)
+        self.popup.hide()
+        self.set_current(name)
+        self.project_chosen.emit(name)
+
+    def mousePressEvent(self, event):
+        super().mousePressEvent(event)
+        if not self.popup.isVisible():
+            # 尚未輸入篩選文字時列出最近修改的專案
+            self.model.set_filter("" if self.text() == self.current_name else self.text())
+            self.show_popup()
+
+    def keyPressEvent(self, event):
+        if self.popup.isVisible():
+            key = event.key()
+            if key in (Qt.Key_Down, Qt.Key_Up):
+                step = 1 if key == Qt.Key_Down else -1
+                row = max(0, min(self.popup.currentIndex().row() + step, self.model.rowCount() - 1))
+                self.popup.setCurrentIndex(self.model.index(row))
+                return
+            if key in (Qt.Key_Return, Qt.Key_Enter):
+                if self.popup.currentIndex().isValid():
+                    self.choose(self.popup.currentIndex())
+                return
+            if key == Qt.Key_Escape:
+                self.popup.hide()
+                return
+        elif event.key() == Qt.Key_Down:
+            self.apply_filter()
+            return
+        super().keyPressEvent(event)
+
+    def focusOutEvent(self, event):
+        super().focusOutEvent(event)
+        self.popup.hide()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.popup.hide()
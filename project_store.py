@@ -0,0 +1,215 @@
+# project_store.py
+# 以 SQLite 儲存專案資料，取代 QSettings 中每個專案一整段 JSON 的做法：
+#   projects 表：一列一個專案，依編號、地址（捷運版為施工日期）、修改時間建立索引
+#   items 表：一列一個施工項目，可只更新有變動的項目
+# namespace 為 info_fields["id"]（"案件編號" 或 "站別"），對應原本 QSettings 的兩個分區
+import os, json, time, sqlite3, threading
+
+from app_paths import user_data_dir
+from instrumentation import span
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY,
+    namespace TEXT NOT NULL,
+    name TEXT NOT NULL,
+    project_id TEXT NOT NULL,
+    address TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    modified_at REAL NOT NULL,
+    UNIQUE (namespace, name)
+);
+CREATE INDEX IF NOT EXISTS idx_projects_project_id ON projects (namespace, project_id);
+CREATE INDEX IF NOT EXISTS idx_projects_address ON projects (namespace, address);
+CREATE INDEX IF NOT EXISTS idx_projects_modified ON projects (namespace, modified_at);
+CREATE TABLE IF NOT EXISTS items (
+    project INTEGER NOT NULL REFERENCES projects (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    description TEXT NOT NULL,
+    time TEXT NOT NULL,
+    image_path TEXT NOT NULL,
+    show_time INTEGER NOT NULL,
+    modified_at REAL NOT NULL,
+    PRIMARY KEY (project, position)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def project_name(id_value, address_value):
+    # 與原本 QSettings 的鍵相同："{編號}-{地址}"
+    return f"{id_value}-{address_value}"
+
+
+def _item_row(project, position, item, now):
+    return (project, position, item.get('施工說明', ''), item.get('時間', ''),
+            item.get('圖片路徑', ''), int(bool(item.get('標註時間', False))), now)
+
+
+class ProjectStore:
+    def __init__(self, path=None):
+        """
+        :param path: 資料庫檔案路徑，預設為使用者資料目錄下的 projects.db
+        """
+        self.path = path or user_data_dir("projects.db")
+        parent = os.path.dirname(self.path)
+        if parent and not os.path.exists(parent):
+            os.makedirs(parent)
+        self._local = threading.local()  # 每個執行緒各自的連線
+        with self._conn() as conn:
+            conn.executescript(SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # ---- 查詢 ----
+    def search_projects(self, namespace, text="", limit=100, offset=0):
+        """
+        搜尋專案，回傳 [(名稱, 編號, 地址, 修改時間)]
+        text 以空白分隔為多個關鍵字，每個關鍵字須為編號或地址的開頭，或出現在名稱中；
+        編號開頭相符者排在前面，其餘依最後修改時間由新到舊排序
+        """
+        conditions = ["namespace = ?"]
+        params = [namespace]
+        keywords = text.split()
+        for keyword in keywords:
+            escaped = keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            conditions.append(
+                "(project_id LIKE ? ESCAPE '\\' OR address LIKE ? ESCAPE '\\' OR name LIKE ? ESCAPE '\\')")
+            params += [escaped + "%", escaped + "%", "%" + escaped + "%"]
+        order = "modified_at DESC"
+        if keywords:
+            order = "CASE WHEN project_id LIKE ? ESCAPE '\\' THEN 0 ELSE 1 END, " + order
+            params.append(params[1])
+        sql = (f"SELECT name, project_id, address, modified_at FROM projects WHERE {' AND '.join(conditions)} "
+               f"ORDER BY {order} LIMIT ? OFFSET ?")
+        return self._conn().execute(sql, params + [limit, offset]).fetchall()
+
+    def load_project(self, namespace, name, info_fields):
+        """
+        讀取專案，回傳與 save_current_project 相同格式的字典；不存在時回傳 None
+        """
+        with span("load_project", namespace=namespace, project=name) as fields:
+            conn = self._conn()
+            row = conn.execute(
+                "SELECT id, project_id, address FROM projects WHERE namespace = ? AND name = ?",
+                (namespace, name)).fetchone()
+            if row is None:
+                fields["found"] = False
+                return None
+            project, id_value, address_value = row
+            items = [{
+                '施工說明': description,
+                '時間': time_val,
+                '圖片路徑': image_path,
+                '標註時間': bool(show_time)
+            } for description, time_val, image_path, show_time in conn.execute(
+                "SELECT description, time, image_path, show_time FROM items WHERE project = ? ORDER BY position",
+                (project,))]
+            fields["items"] = len(items)
+        return {info_fields["id"]: id_value, info_fields["address"]: address_value, 'items': items}
+
+    # ---- 寫入 ----
+    def _upsert_project(self, conn, namespace, id_value, address_value, now, name=None):
+        name = name or project_name(id_value, address_value)
+        conn.execute(
+            "INSERT INTO projects (namespace, name, project_id, address, created_at, modified_at) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (namespace, name) DO UPDATE SET "
+            "project_id = excluded.project_id, address = excluded.address, modified_at = excluded.modified_at",
+            (namespace, name, id_value, address_value, now, now))
+        return conn.execute(
+            "SELECT id FROM projects WHERE namespace = ? AND name = ?", (namespace, name)).fetchone()[0]
+
+    def save_project(self, namespace, project_data, info_fields, name=None):
+        """
+        儲存整個專案（所有項目），回傳專案名稱
+        :param name: 專案名稱，預設為 "{編號}-{地址}"
+        """
+        id_value = project_data[info_fields["id"]]
+        address_value = project_data[info_fields["address"]]
+        items = project_data.get('items', [])
+        now = time.time()
+        conn = self._conn()
+        with span("save_project", namespace=namespace, items=len(items)), conn:
+            project = self._upsert_project(conn, namespace, id_value, address_value, now, name)
+            conn.execute("DELETE FROM items WHERE project = ?", (project,))
+            conn.executemany(
+                "INSERT INTO items (project, position, description, time, image_path, show_time, modified_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [_item_row(project, position, item, now) for position, item in enumerate(items)])
+        return name or project_name(id_value, address_value)
+
+    def save_items(self, namespace, id_value, address_value, changed_items, item_count):
+        """
+        只寫入有變動的項目
+        :param changed_items: {位置: 項目資料}，新增、修改或因排序而移動的項目
+        :param item_count: 目前的項目總數，超出此數量的舊項目會被刪除
+        """
+        now = time.time()
+        conn = self._conn()
+        with span("save_items", namespace=namespace, changed=len(changed_items), items=item_count), conn:
+            project = self._upsert_project(conn, namespace, id_value, address_value, now)
+            conn.executemany(
+                "INSERT INTO items (project, position, description, time, image_path, show_time, modified_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (project, position) DO UPDATE SET "
+                "description = excluded.description, time = excluded.time, image_path = excluded.image_path, "
+                "show_time = excluded.show_time, modified_at = excluded.modified_at",
+                [_item_row(project, position, item, now) for position, item in sorted(changed_items.items())])
+            conn.execute("DELETE FROM items WHERE project = ? AND position >= ?", (project, item_count))
+
+    def remove_project(self, namespace, name):
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM projects WHERE namespace = ? AND name = ?", (namespace, name))
+
+    # ---- 從 QSettings 移轉 ----
+    def migrate_from_qsettings(self, namespace, info_fields):
+        """
+        將 QSettings("MyCompany", "ConstructionPhotoEditor_{namespace}") 中的專案匯入資料庫，
+        每個 namespace 只執行一次；原本的 QSettings 資料保留不刪除
+        :return: 匯入的專案數
+        """
+        from PyQt5.QtCore import QSettings
+        conn = self._conn()
+        flag = f"migrated_qsettings:{namespace}"
+        if conn.execute("SELECT 1 FROM meta WHERE key = ?", (flag,)).fetchone():
+            return 0
+        settings = QSettings("MyCompany", f"ConstructionPhotoEditor_{namespace}")
+        migrated = 0
+        for key in settings.allKeys():
+            try:
+                project_data = json.loads(settings.value(key))
+                self.save_project(namespace, project_data, info_fields, name=key)
+                migrated += 1
+            except Exception as e:
+                print(f"移轉專案失敗：{key}：{e}")
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (flag, str(time.time())))
+        return migrated
+
+
+_default_store = None
+
+def default_store():
+    # GUI 兩個分頁共用同一個資料庫
+    global _default_store
+    if _default_store is None:
+        _default_store = ProjectStore()
+    return _default_store
@@ -0,0 +1,320 @@
+# report_engine.py
+# 不依賴 Qt 的文檔生成引擎：
+# 輸入與 save_current_project 相同格式的專案資料，輸出 .docx 以及燒光碟用的照片資料夾
+import os
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from docxtpl import InlineImage
+from docx.shared import Cm
+from image_loading import open_image, load_resized, exif_orientation, REDUCING_GAP
+from disc_export import DiscExporter
+from template_cache import default_template_cache
+from buffer_arena import BufferArena
+from timestamp_overlay import draw_timestamp, font_name_for, OVERLAY_VERSION
+from stage_timing import StageTimer, active_timer, use_timer, stage, count
+from instrumentation import span
+from output_profile import DEFAULT_OUTPUT_PROFILE
+
+
+class GenerationError(Exception):
+    # 生成過程中的錯誤，訊息可直接顯示給使用者
+    pass
+
+
+class InvalidProjectError(GenerationError):
+    # 專案資料不完整（缺少編號、地址、內容項目或欄位）
+    pass
+
+
+class GenerationCancelled(Exception):
+    # 使用者取消生成
+    pass
+
+
+def validate_project(project_data, info_fields):
+    """
+    檢查專案資料是否完整，回傳 (id_value, address_value, items)
+    """
+    id_value = project_data.get(info_fields["id"], "")
+    address_value = project_data.get(info_fields["address"], "")
+    items = project_data.get("items", [])
+    if not id_value or not address_value:
+        raise InvalidProjectError(f"請輸入{info_fields['id']}和{info_fields['address']}")
+    if not items:
+        raise InvalidProjectError("請至少添加一組內容")
+    for item in items:
+        if not item.get('施工說明') or not item.get('時間') or not item.get('圖片路徑'):
+            raise InvalidProjectError("請填寫所有欄位並選擇圖片")
+    return id_value, address_value, items
+
+
+def disc_folder_name(id_value, address_value):
+    return f"照片-{id_value}-{address_value}"
+
+
+def disc_photo_filename(index, description, id_value, address_value):
+    return f"{index+1:02d}-{description}-{id_value}-{address_value}.jpg"
+
+
+def render_photo(image_path, width_val, height_val, profile=DEFAULT_OUTPUT_PROFILE, time_val=None,
+                 style_name="bottom-right"):
+    """
+    將照片依輸出設定縮放至指定尺寸（公分），指定 time_val 時標註時間（位置與樣式見 timestamp_overlay），
+    回傳 JPEG 位元組
+    """
+    count("bytes_read", os.path.getsize(image_path))
+    image = load_resized(image_path, profile.pixel_size(width_val, height_val))
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    if time_val is not None:
+        with stage("annotate"):
+            draw_timestamp(image, time_val, profile.dpi, style_name)
+    image_bytes = BytesIO()
+    with stage("encode"):
+        image.save(image_bytes, format='JPEG', **profile.jpeg_options())
+    return image_bytes.getvalue()
+
+
+def fits_output_size(image_path, width_val, height_val, profile):
+    # 未標註時間的照片若不大於輸出尺寸且不需轉正，直接嵌入原圖（只讀取檔頭）
+    width_px, height_px = profile.pixel_size(width_val, height_val)
+    with open_image(image_path) as image:
+        return image.width <= width_px and image.height <= height_px and exif_orientation(image) == 1
+
+
+def process_photo(job):
+    """
+    處理單張照片（依輸出設定縮放，需要時標註時間），可在執行緒或子程序中執行
+    :return: JPEG 位元組；照片不大於輸出尺寸且不需標註時間時回傳 None，表示直接嵌入原圖
+    """
+    profile = job["profile"]
+    time_val = job["time"] if job["show_time"] else None
+    cache = job["cache"]
+    try:
+        if time_val is None and fits_output_size(job["image_path"], job["width"], job["height"], profile):
+            return None
+        if cache is not None:
+            stamp = {}
+            if time_val is not None:
+                stamp = {"time": time_val, "style": job["overlay_style"], "overlay_version": OVERLAY_VERSION,
+                         "font": font_name_for(time_val, profile.dpi, job["overlay_style"])}
+            key = cache.make_key(
+                job["image_path"], width=job["width"], height=job["height"],
+                reducing_gap=REDUCING_GAP, upright=True, **profile.cache_params(), **stamp
+            )
+            image_data = cache.get(key)
+            if image_data is not None:
+                count("cache_hits")
+                return image_data
+            count("cache_misses")
+        image_data = render_photo(job["image_path"], job["width"], job["height"], profile, time_val,
+                                  job["overlay_style"])
+    except Exception as e:
+        if time_val is None:
+            raise GenerationError(f"縮放圖片時出錯：{e}") from e
+        raise GenerationError(f"在圖片上標註時間時出錯：{e}") from e
+    count("photos_processed")
+    if cache is not None:
+        cache.put(key, image_data)
+    return image_data
+
+
+def process_photo_timed(job):
+    # 在工作執行緒或子程序中計時，回傳 (結果, 各階段耗時) 供呼叫端合併
+    timer = StageTimer()
+    with use_timer(timer):
+        result = process_photo(job)
+    return result, timer.snapshot()
+
+
+def process_photos(jobs, workers=None, use_processes=False, progress=None, cancel_event=None):
+    """
+    以執行緒池（或程序池）同時處理所有照片，結果依 jobs 的原始順序回傳
+    :param workers: 同時處理的數量，None 表示依 CPU 核心數決定
+    :param use_processes: 是否改用程序池（適合多核心的無視窗批次工作）
+    :param progress: 每完成一張呼叫 progress(已完成數, 總數)
+    :param cancel_event: 具有 is_set() 的物件（例如 threading.Event），設定後取消剩餘工作
+    各階段耗時記錄到呼叫端目前啟用的 StageTimer（見 stage_timing）
+    """
+    results = [None] * len(jobs)
+    if not jobs:
+        return results
+    timer = active_timer()
+    pool_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    pool = pool_class(max_workers=workers)
+    try:
+        task = process_photo if timer is None else process_photo_timed
+        futures = {pool.submit(task, job): i for i, job in enumerate(jobs)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            if cancel_event is not None and cancel_event.is_set():
+                raise GenerationCancelled()
+            if timer is None:
+                results[futures[future]] = future.result()
+            else:
+                results[futures[future]], snapshot = future.result()
+                timer.merge(snapshot)
+            if progress is not None:
+                progress(done, len(jobs))
+    except BaseException:
+        pool.shutdown(wait=True, cancel_futures=True)
+        raise
+    pool.shutdown(wait=True)
+    return results
+
+
+def generate_document(project_data, variant, output_dir="", burn_disc=False, doc=None, memory_budget=None,
+                      cache=None, workers=None, use_processes=False, progress=None, cancel_event=None,
+                      disc_target=None, disc_hardlink=False, timings=None):
+    """
+    :param project_data: 專案資料字典，格式與 save_current_project 寫入的相同
+    :param variant: 版本設定（report_variants 中的類別實例，或具有相同方法的物件）
+    :param output_dir: 輸出 .docx 與燒光碟資料夾的目錄，預設為目前工作目錄
+    :param burn_disc: 是否另外輸出燒光碟用的照片
+    :param doc: 要使用的 DocxTemplate，未指定時從模板快取取得 variant.template_path 的全新複本
+    :param memory_budget: 處理後的圖片在記憶體中最多佔用的位元組數，超過時改存暫存檔（見 buffer_arena）
+    :param cache: photo_cache.PhotoCache，若指定則重複使用先前處理過的照片
+    :param workers, use_processes, progress, cancel_event: 照片處理設定，見 process_photos
+    :param disc_target: 燒光碟照片的輸出位置（資料夾或 .zip），預設為 output_dir 下的 "照片-{編號}-{地址}"
+    :param disc_hardlink: 燒光碟的 JPEG 原圖是否以硬連結取代複製
+    :param timings: stage_timing.StageTimer，記錄各階段耗時（效能測試用）
+    :return: 輸出的 .docx 路徑
+    """
+    return generate_document_parts(
+        project_data, variant, None, output_dir=output_dir, burn_disc=burn_disc, doc=doc,
+        memory_budget=memory_budget, cache=cache, workers=workers, use_processes=use_processes,
+        progress=progress, cancel_event=cancel_event, disc_target=disc_target, disc_hardlink=disc_hardlink,
+        timings=timings
+    )[0]
+
+
+def generate_document_parts(project_data, variant, chunk_size=None, timings=None, **options):
+    """
+    分冊生成：每 chunk_size 個項目輸出一份文檔（檔名見 variant.get_part_filename），
+    每冊使用新的模板複本與圖片緩衝區，存檔後即釋放，記憶體用量不隨項目總數增加
+    項目數不超過 chunk_size（或 chunk_size 為 None）時只輸出一份，檔名與 generate_document 相同
+    燒光碟照片仍為整個專案一個資料夾，編號連續
+    :param options: 其餘參數同 generate_document；分冊時每冊從模板快取取得新的複本，不使用 doc
+    :return: 各冊 .docx 路徑的清單
+    """
+    # 各階段耗時與計數寫入 instrumentation 的效能記錄
+    timer = timings if timings is not None else StageTimer()
+    with span("generate_document", timer, profile=True, variant=getattr(variant, "name", type(variant).__name__),
+              items=len(project_data.get("items", [])), chunk_size=chunk_size, workers=options.get("workers"),
+              use_processes=options.get("use_processes", False), burn_disc=options.get("burn_disc", False),
+              cache=options.get("cache") is not None) as fields:
+        output_paths = _generate_parts(project_data, variant, chunk_size, **options)
+        fields["parts"] = len(output_paths)
+        return output_paths
+
+
+def split_items(items, chunk_size):
+    # chunk_size 為 None 或 0 時不分冊
+    if chunk_size is not None and chunk_size < 0:
+        raise ValueError(f"每冊項目數不可為負數：{chunk_size}")
+    if not chunk_size or len(items) <= chunk_size:
+        return [items]
+    return [items[start:start + chunk_size] for start in range(0, len(items), chunk_size)]
+
+
+def _generate_parts(project_data, variant, chunk_size, output_dir="", burn_disc=False, doc=None, memory_budget=None,
+                    cache=None, workers=None, use_processes=False, progress=None, cancel_event=None,
+                    disc_target=None, disc_hardlink=False):
+    info_fields = variant.info_fields
+    id_value, address_value, items = validate_project(project_data, info_fields)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    chunks = split_items(items, chunk_size)
+
+    # 燒光碟照片在背景輸出，與下方的照片處理及 render 同時進行
+    disc_exporter = None
+    if burn_disc:
+        if disc_target is None:
+            disc_target = os.path.join(output_dir, disc_folder_name(id_value, address_value))
+        disc_exporter = DiscExporter(disc_target, hardlink=disc_hardlink)
+        for i, data in enumerate(items):
+            disc_exporter.submit(data['圖片路徑'], disc_photo_filename(i, data['施工說明'], id_value, address_value))
+
+    output_paths = []
+    try:
+        done_before = 0
+        for part, chunk in enumerate(chunks, start=1):
+            if len(chunks) == 1:
+                filename = variant.get_output_filename(id_value, address_value)
+                part_doc = doc
+            else:
+                filename = variant.get_part_filename(id_value, address_value, part, len(chunks))
+                part_doc = None
+            if part_doc is None:
+                part_doc = default_template_cache().get(variant.template_path)
+            part_progress = None
+            if progress is not None:
+                # 進度以整個專案計算
+                part_progress = lambda done, total, offset=done_before: progress(offset + done, len(items))
+            output_paths.append(_render_part(
+                chunk, part_doc, variant, id_value, address_value, os.path.join(output_dir, filename),
+                memory_budget, cache, workers, use_processes, part_progress, cancel_event
+            ))
+            done_before += len(chunk)
+    except BaseException:
+        if disc_exporter is not None:
+            disc_exporter.close(cancel=True)
+        # 出錯或取消時刪除已寫出的分冊，不留下不完整的一套文檔
+        for path in output_paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        raise
+
+    if disc_exporter is not None:
+        try:
+            disc_exporter.close()
+        except Exception as e:
+            raise GenerationError(f"輸出燒光碟照片時出錯：{e}") from e
+    return output_paths
+
+
+def _render_part(items, doc, variant, id_value, address_value, output_path, memory_budget, cache,
+                 workers, use_processes, progress, cancel_event):
+    # 處理 items 的照片並以 doc 輸出一份文檔；圖片緩衝區只存活到 doc.save 完成
+    info_fields = variant.info_fields
+    width_val, height_val = variant.get_photo_dimensions()
+    jobs = [{
+        "image_path": data['圖片路徑'],
+        "time": data['時間'],
+        "show_time": data.get('標註時間', False),
+        "width": width_val,
+        "height": height_val,
+        "overlay_style": getattr(variant, "overlay_style", "bottom-right"),
+        "profile": getattr(variant, "output_profile", DEFAULT_OUTPUT_PROFILE),
+        "cache": cache,
+    } for data in items]
+    results = process_photos(jobs, workers, use_processes, progress, cancel_event)
+    if cache is not None:
+        cache.trim()
+
+    arena = BufferArena() if memory_budget is None else BufferArena(memory_budget)
+    with arena:
+        processed_items = []
+        for i, data in enumerate(items):
+            if results[i] is not None:
+                image_source = arena.buffer(results[i])
+                results[i] = None  # 已移入緩衝區，不再重複保留
+            else:
+                image_source = data['圖片路徑']
+                count("bytes_read", os.path.getsize(image_source))
+            processed_items.append({
+                info_fields["id"]: id_value,
+                '內容': data['施工說明'],
+                '時間': data['時間'],
+                '圖片': InlineImage(doc, image_source, width=Cm(width_val), height=Cm(height_val))
+            })
+
+        if cancel_event is not None and cancel_event.is_set():
+            raise GenerationCancelled()
+        with stage("render"):
+            doc.render({'items': processed_items})
+        with stage("save"):
+            doc.save(output_path)
+        count("bytes_written", os.path.getsize(output_path))
+    return output_path
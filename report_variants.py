@@ -0,0 +1,53 @@
+# report_variants.py
+# 各版本（案件版、捷運版）的報表設定，不依賴 Qt，可同時供 GUI 與命令列使用
+import os
+
+from output_profile import OutputProfile
+
+
+class CaseReport:
+    # 案件版
+    name = "case"
+    label = "案件版"
+    template_path = "施工照片.docx"
+    saved_data_file = "saved_data.json"
+    info_fields = {"id": "案件編號", "address": "案件地址"}
+    overlay_style = "bottom-right"  # 時間標註樣式，見 timestamp_overlay.OVERLAY_STYLES
+    output_profile = OutputProfile(dpi=300, quality=85)  # 嵌入照片的解析度與 JPEG 壓縮設定
+
+    def get_output_filename(self, id_value, address_value):
+        # 輸出檔名為 "{id_value}.docx"
+        return f"{id_value}.docx"
+
+    def get_part_filename(self, id_value, address_value, part, part_count):
+        # 分冊輸出時在原檔名後加上冊數，例如 "A001-2of5.docx"；冊數補零讓檔案依序排列
+        stem, ext = os.path.splitext(self.get_output_filename(id_value, address_value))
+        width = len(str(part_count))
+        return f"{stem}-{part:0{width}d}of{part_count}{ext}"
+
+    def get_photo_dimensions(self):
+        # 案件版尺寸：寬 10 cm, 高 6.5 cm
+        return (10, 6.5)
+
+
+class StationReport(CaseReport):
+    # 捷運版
+    name = "station"
+    label = "捷運版"
+    template_path = "照片.docx"
+    saved_data_file = "saved_data_station.json"
+    info_fields = {"id": "站別", "address": "施工日期"}
+
+    def get_output_filename(self, id_value, address_value):
+        # 輸出格式為 "施工日期(站別).docx"
+        return f"{address_value}({id_value}).docx"
+
+    def get_photo_dimensions(self):
+        # 捷運版尺寸：寬 8.3 cm, 高 5.4 cm
+        return (8.3, 5.4)
+
+
+VARIANTS = {
+    CaseReport.name: CaseReport,
+    StationReport.name: StationReport,
+}
@@ -0,0 +1,78 @@
+# stage_timing.py
+# 生成流程各階段的計時：以 with stage("decode"): 包住要量測的程式碼，count("cache_hits") 累加計數，
+# 結果累加到目前執行緒啟用的 StageTimer；沒有啟用任何 StageTimer 時不做任何事
+import threading, time
+from contextlib import contextmanager
+
+# decode 解碼、resize 縮放、annotate 標註時間、encode 壓縮 JPEG、
+# render 套用模板、save 寫出 .docx、disc_copy 輸出燒光碟照片
+STAGES = ("decode", "resize", "annotate", "encode", "render", "save", "disc_copy")
+
+_local = threading.local()
+
+
+class StageTimer:
+    # 各階段的累計秒數與次數，以及計數器；多個執行緒同時處理照片時為各執行緒耗時的總和
+    def __init__(self):
+        self.seconds = {}
+        self.counts = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def add(self, name, seconds, count=1):
+        with self._lock:
+            self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+            self.counts[name] = self.counts.get(name, 0) + count
+
+    def increment(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def merge(self, snapshot):
+        # 合併其他執行緒或子程序回傳的 snapshot()
+        for name, (seconds, count) in snapshot["stages"].items():
+            self.add(name, seconds, count)
+        for name, amount in snapshot["counters"].items():
+            self.increment(name, amount)
+
+    def snapshot(self):
+        # 回傳 {"stages": {名稱: (秒數, 次數)}, "counters": {名稱: 數量}}，可在程序間傳遞
+        with self._lock:
+            return {
+                "stages": {name: (self.seconds[name], self.counts[name]) for name in self.seconds},
+                "counters": dict(self.counters),
+            }
+
+
+def active_timer():
+    return getattr(_local, "timer", None)
+
+
+@contextmanager
+def use_timer(timer):
+    # 在 with 區塊內讓目前執行緒的 stage() 記錄到 timer；timer 為 None 時停用計時
+    previous = active_timer()
+    _local.timer = timer
+    try:
+        yield timer
+    finally:
+        _local.timer = previous
+
+
+@contextmanager
+def stage(name):
+    timer = active_timer()
+    if timer is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(name, time.perf_counter() - start)
+
+
+def count(name, amount=1):
+    timer = active_timer()
+    if timer is not None:
+        timer.increment(name, amount)
@@ -0,0 +1,43 @@
+# template_cache.py
+# 模板快取：每個模板檔只讀取、解析一次，之後每次生成取得一份解析好的 XML 的複本，
+# 各次 render 互不影響，可同時生成多份文檔；模板檔修改時間改變時自動重新載入
+import os, copy, threading
+from io import BytesIO
+from docx import Document
+from docxtpl import DocxTemplate
+
+
+class TemplateCache:
+    def __init__(self):
+        self._entries = {}   # 絕對路徑 -> (修改時間, 檔案內容, 解析後的 Document)
+        self._lock = threading.Lock()
+
+    def get(self, template_path):
+        """
+        回傳可直接 render 的全新 DocxTemplate
+        """
+        path = os.path.abspath(template_path)
+        mtime = os.stat(path).st_mtime_ns
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry[0] != mtime:
+                with open(path, "rb") as f:
+                    data = f.read()
+                entry = (mtime, data, Document(BytesIO(data)))
+                self._entries[path] = entry
+            # 複製已解析的 XML 樹，比重新解壓縮、解析整個 .docx 快
+            docx = copy.deepcopy(entry[2])
+        doc = DocxTemplate(BytesIO(entry[1]))
+        doc.docx = docx
+        return doc
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+def default_template_cache():
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = TemplateCache()
+        return _default_cache
@@ -0,0 +1,13 @@
+# tests/conftest.py
+# 測試共用設定：模組位於專案根目錄；Qt 以 offscreen 平台執行，不需要顯示器
+# 效能記錄、專案資料庫、照片快取與 QSettings 都改到暫存目錄，測試不會寫入使用者的資料
+# （需在匯入專案模組之前設定）
+import os, sys, atexit, shutil, tempfile
+
+_data_root = tempfile.mkdtemp(prefix="construction-tests-")
+atexit.register(shutil.rmtree, _data_root, ignore_errors=True)
+for _name in ("APPDATA", "LOCALAPPDATA", "XDG_DATA_HOME", "XDG_CACHE_HOME", "XDG_CONFIG_HOME"):
+    os.environ[_name] = os.path.join(_data_root, _name.lower())
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,117 @@
+# tests/test_autosave.py
+import time
+
+import pytest
+from PyQt5.QtWidgets import QApplication
+
+from app_functionality import ConstructionApp
+from item_list import ITEM_DATA_ROLE
+
+NAMESPACE = "案件編號"
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def window(app):
+    window = ConstructionApp()
+    for id_value, address_value in (("A", "x"), ("B", "y")):
+        window.store.save_project(NAMESPACE, {"案件編號": id_value, "案件地址": address_value,
+                                              "items": [{"施工說明": f"{id_value}-1"}]}, window.info_fields)
+    yield window
+    window.close()
+    window.deleteLater()
+
+
+def process_events(app, seconds=0.3):
+    # 讓背景寫入完成後排入主執行緒的 finished signal 有機會執行
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+
+
+def choose(window, name):
+    # 與在選擇器中點選專案相同
+    window.project_selector.set_current(name)
+    window.load_selected_project(name)
+
+
+def edit_first_item(window, description):
+    index = window.item_model.index(0)
+    window.item_model.setData(index, dict(index.data(ITEM_DATA_ROLE), 施工說明=description))
+
+
+def test_switching_project_ignores_late_autosave(app, window):
+    choose(window, "A-x")
+    process_events(app)
+    edit_first_item(window, "A-1 已修改")
+    # 在自動儲存的等待時間內切換到 B：A 的變更先寫入，之後才收到 A 的 finished
+    choose(window, "B-y")
+    process_events(app)
+
+    assert window.id_input.text() == "B"
+    assert window.project_selector.current_project() == "B-y"
+    saved = window.store.load_project(NAMESPACE, "A-x", window.info_fields)
+    assert saved["items"][0]["施工說明"] == "A-1 已修改"
+
+
+def test_removed_project_is_not_restored_in_picker(app, window, monkeypatch):
+    monkeypatch.setattr("base_construction.QMessageBox.information", lambda *args: None)
+    choose(window, "A-x")
+    process_events(app)
+    edit_first_item(window, "A-1 已修改")
+    window.autosaver.save_now()  # 寫入進行中即移除
+    window.remove_project()
+    process_events(app)
+
+    assert window.project_selector.current_project() is None
+
+
+def test_failed_autosave_is_retried_and_reported_once(app, window, monkeypatch):
+    choose(window, "A-x")
+    process_events(app)
+    save_items = window.store.save_items
+    failures = []
+
+    def fail_once(*args):
+        if not failures:
+            failures.append(args)
+            raise OSError("disk full")
+        return save_items(*args)
+
+    monkeypatch.setattr(window.store, "save_items", fail_once)
+    critical = []
+    monkeypatch.setattr("base_construction.QMessageBox.critical", lambda *args: critical.append(args))
+    edit_first_item(window, "A-1 已修改")
+    window.autosaver.save_now()
+    process_events(app)
+
+    # 磁碟恢復後切換專案：之前的錯誤不再拋出，失敗的變更會重新寫入
+    choose(window, "B-y")
+    process_events(app)
+    assert critical == []
+    assert window.id_input.text() == "B"
+    saved = window.store.load_project(NAMESPACE, "A-x", window.info_fields)
+    assert saved["items"][0]["施工說明"] == "A-1 已修改"
+
+
+def test_remove_project_reports_failed_write(app, window, monkeypatch):
+    # 移除前等待的寫入失敗時顯示錯誤，不讓例外離開 slot
+    choose(window, "A-x")
+    process_events(app)
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(window.store, "save_items", fail)
+    critical = []
+    monkeypatch.setattr("base_construction.QMessageBox.critical", lambda *args: critical.append(args))
+    edit_first_item(window, "A-1 已修改")
+    window.autosaver.save_now()
+    window.remove_project()
+    assert len(critical) == 1 and "disk full" in critical[0][2]
+    assert window.store.load_project(NAMESPACE, "A-x", window.info_fields) is not None
@@ -0,0 +1,62 @@
+# tests/test_item_list.py
+import time, faulthandler
+
+import pytest
+from PIL import Image
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication
+
+from item_list import ProjectItemModel
+
+PHOTO_COUNT = 8
+TIMEOUT = 30
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def make_photos(directory, count):
+    paths = []
+    for i in range(count):
+        # 含透明度的 PNG 解碼為 ARGB32，轉成 QPixmap 時需要轉換格式（Qt 會分段排入全域執行緒池）
+        path = directory / f"photo-{i}.png"
+        Image.new("RGBA", (2000 + i * 16, 1500), (40 * i % 256, 90, 160, 200)).save(path)
+        paths.append(str(path))
+    return paths
+
+
+def test_thumbnails_arrive_for_every_row(app, tmp_path):
+    # 回歸測試：縮圖曾排入 Qt 的全域執行緒池，QPixmap.fromImage 等待同一個池而卡住主執行緒
+    paths = make_photos(tmp_path, PHOTO_COUNT)
+    model = ProjectItemModel()
+    model.set_items([{"施工說明": f"項目{i}", "圖片路徑": path} for i, path in enumerate(paths)])
+
+    def pixmaps():
+        return [model.data(model.index(row), Qt.DecorationRole) for row in range(model.rowCount())]
+
+    # 卡住時直接結束並印出各執行緒的堆疊，而不是讓測試永遠停住
+    faulthandler.dump_traceback_later(TIMEOUT * 2, exit=True)
+    try:
+        deadline = time.monotonic() + TIMEOUT
+        while any(pixmap is None for pixmap in pixmaps()) and time.monotonic() < deadline:
+            app.processEvents()
+            time.sleep(0.01)
+    finally:
+        faulthandler.cancel_dump_traceback_later()
+
+    loaded = pixmaps()
+    assert all(pixmap is not None and not pixmap.isNull() for pixmap in loaded)
+    assert len({pixmap.cacheKey() for pixmap in loaded}) == PHOTO_COUNT
+
+
+def test_mark_all_dirty_after_failed_save(app):
+    model = ProjectItemModel()
+    model.set_items([{"施工說明": "一"}, {"施工說明": "二"}])
+    assert not model.has_changes()
+    model.mark_all_dirty()
+    assert model.has_changes()
+    changed, count = model.take_changes()
+    assert sorted(changed) == [0, 1] and count == 2
+    assert not model.has_changes()
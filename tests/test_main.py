@@ -0,0 +1,30 @@
+# tests/test_main.py
+import pytest
+from PyQt5.QtWidgets import QApplication
+
+import main
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def test_batch_dialog_flushes_both_tabs(app, monkeypatch):
+    # 另一個分頁尚在等待自動儲存的內容，也要出現在批次清單中
+    opened = []
+    monkeypatch.setattr(main.BatchDialog, "exec_", lambda dialog: opened.append(dialog))
+    window = main.MainWindow()
+    window.tabs.setCurrentWidget(window.case_tab)
+    tab = window.mrt_tab
+    tab.id_input.setText("S1")
+    tab.address_input.setText("2024-05-01")
+    tab.item_model.append_item({"施工說明": "捷運項目"})
+    assert tab.autosaver.timer.isActive()
+
+    window.open_batch_dialog()
+
+    assert len(opened) == 1
+    saved = tab.store.load_project(tab.info_fields["id"], "S1-2024-05-01", tab.info_fields)
+    assert saved["items"][0]["施工說明"] == "捷運項目"
+    window.close()
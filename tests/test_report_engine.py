@@ -0,0 +1,69 @@
+# tests/test_report_engine.py
+import os, threading
+
+import pytest
+from PIL import Image
+
+from report_variants import VARIANTS
+from report_engine import generate_document_parts, split_items, GenerationCancelled
+from benchmark_generation import make_template, make_project
+from generate_cli import build_parser
+
+
+@pytest.fixture
+def variant(tmp_path):
+    variant = VARIANTS["case"]()
+    variant.template_path = str(tmp_path / "template.docx")
+    make_template(variant.template_path, variant)
+    return variant
+
+
+@pytest.fixture
+def photos(tmp_path):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"photo-{i}.jpg"
+        Image.new("RGB", (800, 600), (60 * i, 120, 200)).save(path)
+        paths.append(str(path))
+    return paths
+
+
+def test_split_items():
+    items = list(range(5))
+    assert split_items(items, None) == [items]
+    assert split_items(items, 0) == [items]
+    assert split_items(items, 5) == [items]
+    assert split_items(items, 2) == [[0, 1], [2, 3], [4]]
+    with pytest.raises(ValueError):
+        split_items(items, -1)
+
+
+@pytest.mark.parametrize("value", ["0", "-3"])
+def test_cli_rejects_chunk_size_below_one(value):
+    with pytest.raises(SystemExit):
+        build_parser().parse_args(["專案.json", "--chunk-size", value])
+
+
+def test_parts_written(tmp_path, variant, photos):
+    output_dir = tmp_path / "output"
+    project_data = make_project(variant, photos, 5, 0.5, seed=1)
+    paths = generate_document_parts(project_data, variant, 2, output_dir=str(output_dir), workers=1)
+    names = [os.path.basename(path) for path in paths]
+    assert [name.rsplit("-", 1)[-1] for name in names] == ["1of3.docx", "2of3.docx", "3of3.docx"]
+    assert sorted(p.name for p in output_dir.glob("*.docx")) == sorted(names)
+
+
+def test_cancel_removes_written_parts(tmp_path, variant, photos):
+    # 第一冊寫出後才取消，已寫出的分冊也要刪除
+    output_dir = tmp_path / "output"
+    project_data = make_project(variant, photos, 6, 0.0, seed=1)
+    cancel_event = threading.Event()
+
+    def progress(done, total):
+        if done > 2:
+            cancel_event.set()
+
+    with pytest.raises(GenerationCancelled):
+        generate_document_parts(project_data, variant, 2, output_dir=str(output_dir), workers=1,
+                                progress=progress, cancel_event=cancel_event)
+    assert list(output_dir.glob("*.docx")) == []
@@ -0,0 +1,28 @@
+# tests/test_timestamp_overlay.py
+from PIL import Image, ImageDraw, ImageChops
+
+from timestamp_overlay import OVERLAY_STYLES, text_masks, load_font, needs_cjk
+
+DPI = 1024
+TEXT = "2024/05/01"
+STYLE = "bottom-right-outline"
+
+
+def reference_stroke(text, dpi, style_name):
+    # 在留有足夠邊界的畫布上繪製完整的外框，作為比較基準
+    style = OVERLAY_STYLES[style_name]
+    font, _ = load_font(max(1, round(dpi * style.font_size)), needs_cjk(text))
+    stroke = round(dpi * style.stroke_width)
+    canvas = Image.new("L", (2000, 1000), 0)
+    ImageDraw.Draw(canvas).text((100, 100), text, font=font, fill=255, stroke_width=stroke, stroke_fill=255)
+    return canvas.crop(canvas.getbbox())
+
+
+def test_stroke_mask_is_not_clipped():
+    _, stroke_mask, bbox = text_masks(TEXT, DPI, STYLE)
+    assert stroke_mask.size == (bbox[2] - bbox[0], bbox[3] - bbox[1])
+    reference = reference_stroke(TEXT, DPI, STYLE)
+    cropped = stroke_mask.crop(stroke_mask.getbbox())
+    assert cropped.size == reference.size
+    assert ImageChops.difference(cropped, reference).getbbox() is None
+
@@ -0,0 +1,128 @@
+# timestamp_overlay.py
+# 照片右下角（或其他位置）的時間標註：
+#   字型依序嘗試 Windows／Linux／macOS 常見字型，含中日韓文字時優先使用 CJK 字型，載入結果會快取；
+#   每種「文字＋字級＋樣式」只繪製一次文字遮罩，之後以遮罩直接把顏色貼到每張照片上
+from functools import lru_cache
+from PIL import Image, ImageDraw, ImageFont
+
+OVERLAY_VERSION = 2  # 標註的繪製方式改變時遞增，使 photo_cache 中舊的標註照片失效
+
+LATIN_FONTS = ["arial.ttf", "Arial.ttf", "DejaVuSans.ttf", "LiberationSans-Regular.ttf"]
+CJK_FONTS = [
+    "msjh.ttc", "msjhl.ttc", "mingliu.ttc",                     # Windows 微軟正黑體、細明體
+    "NotoSansCJK-Regular.ttc", "NotoSansCJKtc-Regular.otf",     # Linux Noto
+    "wqy-microhei.ttc", "wqy-zenhei.ttc",
+    "PingFang.ttc", "/System/Library/Fonts/PingFang.ttc",       # macOS
+]
+
+
+class OverlayStyle:
+    def __init__(self, position="bottom-right", fill=(255, 0, 0), font_size=1 / 6,
+                 margin=(50 / 1024, 120 / 1024), stroke_width=0, stroke_fill=(255, 255, 255)):
+        """
+        尺寸皆以英吋表示，依輸出 dpi 換算為像素，因此不同解析度下標註在紙上的大小相同
+        :param position: "bottom-right"、"bottom-left"、"top-right" 或 "top-left"
+        :param fill: 文字顏色 (R, G, B)
+        :param font_size: 字級（英吋）；預設 1/6 英吋，與原本 1024 dpi 時的 dpi // 6 像素相同
+        :param margin: 與照片邊緣的水平、垂直距離（英吋）
+        :param stroke_width: 外框寬度（英吋），0 表示不加外框
+        :param stroke_fill: 外框顏色 (R, G, B)
+        """
+        self.position = position
+        self.fill = fill
+        self.font_size = font_size
+        self.margin = margin
+        self.stroke_width = stroke_width
+        self.stroke_fill = stroke_fill
+
+
+# 各版本可在 report_variants 中以 overlay_style 指定下列樣式名稱
+OVERLAY_STYLES = {
+    "bottom-right": OverlayStyle(),
+    "bottom-right-outline": OverlayStyle(stroke_width=4 / 1024),
+    "bottom-left": OverlayStyle(position="bottom-left"),
+    "top-right": OverlayStyle(position="top-right", margin=(50 / 1024, 50 / 1024)),
+}
+
+
+def needs_cjk(text):
+    return any(ord(ch) > 0x2E7F for ch in text)
+
+
+@lru_cache(maxsize=None)
+def load_font(size, cjk=False):
+    """
+    回傳 (字型, 字型名稱)；找不到任何字型時使用 Pillow 內建字型
+    """
+    candidates = CJK_FONTS + LATIN_FONTS if cjk else LATIN_FONTS + CJK_FONTS
+    for name in candidates:
+        try:
+            return ImageFont.truetype(name, size), name
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(size), "default"
+    except TypeError:
+        # Pillow 10.1 以前的內建字型不能指定大小
+        return ImageFont.load_default(), "default"
+
+
+def font_name_for(text, dpi, style_name):
+    # 供快取鍵使用：實際會用來繪製此文字的字型名稱
+    style = OVERLAY_STYLES[style_name]
+    return load_font(max(1, round(dpi * style.font_size)), needs_cjk(text))[1]
+
+
+@lru_cache(maxsize=256)
+def text_masks(text, dpi, style_name):
+    """
+    繪製文字遮罩並快取，回傳 (文字遮罩, 外框遮罩或 None, 文字範圍)；
+    遮罩涵蓋整個文字範圍（含外框），左上角對應文字原點加上 (bbox[0], bbox[1])
+    """
+    style = OVERLAY_STYLES[style_name]
+    font, _ = load_font(max(1, round(dpi * style.font_size)), needs_cjk(text))
+    stroke = round(dpi * style.stroke_width)
+    probe = ImageDraw.Draw(Image.new("L", (1, 1)))
+    # 有外框時範圍從 (-stroke, -stroke) 開始，文字需平移繪製，外框的左、上緣才不會被裁掉
+    bbox = probe.textbbox((0, 0), text, font=font, stroke_width=stroke)
+    size = (max(1, bbox[2] - bbox[0]), max(1, bbox[3] - bbox[1]))
+    origin = (-bbox[0], -bbox[1])
+    fill_mask = Image.new("L", size, 0)
+    ImageDraw.Draw(fill_mask).text(origin, text, font=font, fill=255)
+    stroke_mask = None
+    if stroke:
+        stroke_mask = Image.new("L", size, 0)
+        ImageDraw.Draw(stroke_mask).text(origin, text, font=font, fill=255, stroke_width=stroke, stroke_fill=255)
+    return fill_mask, stroke_mask, bbox
+
+
+def draw_timestamp(image, text, dpi, style_name="bottom-right"):
+    """
+    將時間文字貼到 image 上（直接修改 image）
+    """
+    style = OVERLAY_STYLES[style_name]
+    fill_mask, stroke_mask, bbox = text_masks(text, dpi, style_name)
+    text_width = bbox[2] - bbox[0]
+    text_height = bbox[3] - bbox[1]
+    margin_x = round(dpi * style.margin[0])
+    margin_y = round(dpi * style.margin[1])
+    if style.position.endswith("right"):
+        x = image.width - text_width - margin_x
+    else:
+        x = margin_x - bbox[0]
+    if style.position.startswith("bottom"):
+        y = image.height - text_height - margin_y
+    else:
+        y = margin_y - bbox[1]
+    # (x, y) 為文字原點，遮罩的左上角在原點加上 (bbox[0], bbox[1])
+    paste_at = (x + bbox[0], y + bbox[1])
+    if stroke_mask is not None:
+        image.paste(_color_for(image, style.stroke_fill), paste_at, stroke_mask)
+    image.paste(_color_for(image, style.fill), paste_at, fill_mask)
+    return image
+
+
+def _color_for(image, rgb):
+    if image.mode == "L":
+        return round(0.299 * rgb[0] + 0.587 * rgb[1] + 0.114 * rgb[2])
+    return rgb
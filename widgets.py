@@ -4,10 +4,17 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton,
     QFileDialog, QFrame, QFormLayout, QTextEdit, QCheckBox
 )
-from PyQt5.QtGui import QPixmap, QCursor
-from PyQt5.QtCore import Qt, QEvent, QPoint
+from PyQt5.QtGui import QCursor
+from PyQt5.QtCore import Qt, QEvent, QPoint, pyqtSignal
+
+from pixmap_cache import cached_pixmap
+
+PREVIEW_SIZE = (500, 300)
+ZOOM_SIZE = (1600, 900)
 
 class FormItemWidget(QWidget):
+    changed = pyqtSignal()  # 任一欄位被使用者修改時發出
+
     def __init__(self, item_data=None, parent=None):
         super().__init__(parent)
         self.init_ui(item_data)
@@ -66,19 +73,30 @@ class FormItemWidget(QWidget):
         
         main_layout.addWidget(frame)
         
+        self.description_input.textChanged.connect(self.changed)
+        self.time_input.textChanged.connect(self.changed)
+        self.image_path_input.textChanged.connect(self.changed)
+        self.time_checkbox.toggled.connect(self.changed)
+        
         if item_data:
             self.set_data(item_data)
 
-    def set_data(self, item_data):
+    def set_data(self, item_data, load_preview=True):
+        """
+        :param load_preview: 是否立即解碼預覽圖；由清單的背景縮圖載入時傳入 False，之後再呼叫 set_preview_pixmap
+        """
+        # 以程式設定資料時不發出 changed
+        self.blockSignals(True)
         self.description_input.setPlainText(item_data.get('施工說明', ''))
         self.time_input.setText(item_data.get('時間', ''))
         self.image_path_input.setText(item_data.get('圖片路徑', ''))
         path = item_data.get('圖片路徑', '')
-        if path:
-            pixmap = QPixmap(path).scaled(500, 300, Qt.KeepAspectRatio)
-            self.image_preview_label.setPixmap(pixmap)
-            self.image_preview_label.setProperty("original_pixmap", QPixmap(path))
+        if path and load_preview:
+            self.set_preview_image(path)
+        elif path != self.image_preview_label.property("image_path"):
+            self.clear_preview()
         self.time_checkbox.setChecked(item_data.get('標註時間', False))
+        self.blockSignals(False)
 
     def get_data(self):
         return {
@@ -96,18 +114,29 @@ class FormItemWidget(QWidget):
         )
         if file_path:
             self.image_path_input.setText(file_path)
-            pixmap = QPixmap(file_path).scaled(500, 300, Qt.KeepAspectRatio)
-            self.image_preview_label.setPixmap(pixmap)
-            self.image_preview_label.setProperty("original_pixmap", QPixmap(file_path))
+            self.set_preview_image(file_path)
+
+    def set_preview_image(self, path):
+        self.set_preview_pixmap(path, cached_pixmap(path, *PREVIEW_SIZE))
+
+    def set_preview_pixmap(self, path, pixmap):
+        self.image_preview_label.setPixmap(pixmap)
+        self.image_preview_label.setProperty("image_path", path)
+
+    def clear_preview(self):
+        self.image_preview_label.clear()
+        self.image_preview_label.setText("圖片預覽")
+        self.image_preview_label.setProperty("image_path", None)
 
     def eventFilter(self, source, event):
-        if source == self.image_preview_label and self.image_preview_label.property("original_pixmap") is not None:
+        if source == self.image_preview_label and self.image_preview_label.property("image_path") is not None:
             if event.type() == QEvent.Enter:
                 if not hasattr(self, 'zoom_label') or self.zoom_label is None:
                     self.zoom_label = QLabel(self)
                     self.zoom_label.setWindowFlags(Qt.ToolTip)
-                original_pixmap = self.image_preview_label.property("original_pixmap")
-                self.zoom_label.setPixmap(original_pixmap.scaled(1600, 900, Qt.KeepAspectRatio))
+                # 放大圖不常駐於元件中，每次從共用快取取得（被淘汰時才重新解碼）
+                zoom_pixmap = cached_pixmap(self.image_preview_label.property("image_path"), *ZOOM_SIZE)
+                self.zoom_label.setPixmap(zoom_pixmap)
                 cursor_pos = QCursor.pos()
                 self.zoom_label.move(cursor_pos + QPoint(20, 20))
                 self.zoom_label.show()